@@ -15,8 +15,13 @@ from app.db.base import Base
 from app.models.user import User, UserRole
 from app.models.issue_type import IssueType
 from app.models.issue import Issue, IssueStatus
-from app.models.attachment import IssueAttachment
+from app.models.attachment import IssueAttachment, IssueAttachmentVariant
 from app.models.app_settings import AppSettings
+from app.models.staff_workload import StaffWorkload
+from app.models.comment import IssueComment
+from app.models.notification_outbox import NotificationOutbox
+from app.models.notification_preference import NotificationPreference
+from app.models.notification_digest import NotificationDigestItem
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -0,0 +1,47 @@
+"""add issue_attachment_variants for thumbnails / WebP renditions
+
+Revision ID: add_attachment_variants
+Revises: add_issue_version
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_attachment_variants'
+down_revision: Union[str, Sequence[str], None] = 'add_issue_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'issue_attachment_variants',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('attachment_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('url', sa.String(length=500), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=False),
+        sa.Column('width', sa.Integer(), nullable=False),
+        sa.Column('height', sa.Integer(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['attachment_id'], ['issue_attachments.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('attachment_id', 'kind', name='uq_attachment_variant_kind'),
+    )
+    op.create_index(
+        op.f('ix_issue_attachment_variants_attachment_id'),
+        'issue_attachment_variants',
+        ['attachment_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_issue_attachment_variants_attachment_id'), table_name='issue_attachment_variants')
+    op.drop_table('issue_attachment_variants')
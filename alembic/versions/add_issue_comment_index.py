@@ -0,0 +1,41 @@
+"""issue_comments table under alembic, (issue_id, created_at, id) index
+
+Revision ID: add_issue_comment_index
+Revises: add_staff_workload
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_issue_comment_index'
+down_revision: Union[str, Sequence[str], None] = 'add_staff_workload'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The table predates the migrations on existing deployments
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS issue_comments (
+            id SERIAL PRIMARY KEY,
+            issue_id INTEGER NOT NULL REFERENCES issues(id) ON DELETE CASCADE,
+            user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+            body TEXT NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_issue_comments_issue_id_created_at "
+        "ON issue_comments (issue_id, created_at, id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_issue_comments_issue_id_created_at', table_name='issue_comments')
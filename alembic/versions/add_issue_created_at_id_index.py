@@ -0,0 +1,32 @@
+"""add (created_at, id) index on issues for keyset pagination
+
+Revision ID: add_issue_created_at_id_index
+Revises: add_issue_geo_cell
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_issue_created_at_id_index'
+down_revision: Union[str, Sequence[str], None] = 'add_issue_geo_cell'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_issues_created_at_id',
+        'issues',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_issues_created_at_id', table_name='issues')
@@ -0,0 +1,44 @@
+"""add issues.geo_cell spatial key
+
+Adds a fixed-grid cell id (see app/services/geo.py) to issues, backfills it from lat/lng
+and indexes it so proximity checks only scan neighbouring cells.
+
+Revision ID: add_issue_geo_cell
+Revises: add_settings_fields
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_issue_geo_cell'
+down_revision: Union[str, Sequence[str], None] = 'add_settings_fields'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.services.geo.CELL_DEG / LNG_CELLS
+CELL_DEG = 0.001
+LNG_CELLS = 360000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('issues', sa.Column('geo_cell', sa.BigInteger(), nullable=True))
+    op.execute(
+        f"""
+        UPDATE issues
+        SET geo_cell = floor((lat + 90) / {CELL_DEG})::bigint * {LNG_CELLS}
+                     + floor((lng + 180) / {CELL_DEG})::bigint
+        WHERE lat IS NOT NULL AND lng IS NOT NULL
+        """
+    )
+    op.create_index(op.f('ix_issues_geo_cell'), 'issues', ['geo_cell'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_issues_geo_cell'), table_name='issues')
+    op.drop_column('issues', 'geo_cell')
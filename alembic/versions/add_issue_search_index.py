@@ -0,0 +1,61 @@
+"""add full-text and trigram search indexes on issues
+
+Adds a generated, weighted tsvector column (title A, address B, description C) with a
+GIN index, and pg_trgm GIN indexes on title and address for partial-word matching.
+
+Revision ID: add_issue_search_index
+Revises: add_issue_created_at_id_index
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_issue_search_index'
+down_revision: Union[str, Sequence[str], None] = 'add_issue_created_at_id_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        """
+        ALTER TABLE issues ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(address, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+        ) STORED
+        """
+    )
+    op.create_index(
+        'ix_issues_search_vector', 'issues', ['search_vector'], unique=False, postgresql_using='gin'
+    )
+    op.create_index(
+        'ix_issues_title_trgm',
+        'issues',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_issues_address_trgm',
+        'issues',
+        ['address'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'address': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_issues_address_trgm', table_name='issues')
+    op.drop_index('ix_issues_title_trgm', table_name='issues')
+    op.drop_index('ix_issues_search_vector', table_name='issues')
+    op.drop_column('issues', 'search_vector')
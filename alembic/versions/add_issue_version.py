@@ -0,0 +1,27 @@
+"""add issues.version for ETags
+
+Revision ID: add_issue_version
+Revises: add_issue_search_index
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_issue_version'
+down_revision: Union[str, Sequence[str], None] = 'add_issue_search_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('issues', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('issues', 'version')
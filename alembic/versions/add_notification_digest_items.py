@@ -0,0 +1,43 @@
+"""add notification_digest_items
+
+Revision ID: add_notification_digest_items
+Revises: add_notification_preferences
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_notification_digest_items'
+down_revision: Union[str, Sequence[str], None] = 'add_notification_preferences'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_digest_items',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('to_email', sa.String(length=255), nullable=False),
+        sa.Column('template', sa.String(length=40), nullable=False),
+        sa.Column('args', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_notification_digest_items_to_email_created_at',
+        'notification_digest_items',
+        ['to_email', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notification_digest_items_to_email_created_at', table_name='notification_digest_items')
+    op.drop_table('notification_digest_items')
@@ -0,0 +1,49 @@
+"""add notification_preferences
+
+Revision ID: add_notification_preferences
+Revises: add_notification_outbox
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_notification_preferences'
+down_revision: Union[str, Sequence[str], None] = 'add_notification_outbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_preferences',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('email_enabled', sa.Boolean(), server_default='true', nullable=False),
+        sa.Column('push_enabled', sa.Boolean(), server_default='true', nullable=False),
+        sa.Column('watch_all_comments', sa.Boolean(), server_default='false', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_index(
+        'ix_notification_preferences_watchers',
+        'notification_preferences',
+        ['user_id'],
+        unique=False,
+        postgresql_where=sa.text('watch_all_comments = true'),
+    )
+    # admins were notified of every comment before preferences existed; keep that
+    op.execute(
+        "INSERT INTO notification_preferences (user_id, watch_all_comments) "
+        "SELECT id, true FROM users WHERE role IN ('admin', 'super_admin')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notification_preferences_watchers', table_name='notification_preferences')
+    op.drop_table('notification_preferences')
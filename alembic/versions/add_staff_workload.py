@@ -0,0 +1,49 @@
+"""add staff_workload open-issue counters
+
+Revision ID: add_staff_workload
+Revises: add_attachment_variants
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_staff_workload'
+down_revision: Union[str, Sequence[str], None] = 'add_attachment_variants'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'staff_workload',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('open_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_index('ix_staff_workload_open_count_user_id', 'staff_workload', ['open_count', 'user_id'], unique=False)
+    # seed from current data
+    op.execute(
+        """
+        INSERT INTO staff_workload (user_id, open_count)
+        SELECT u.id, count(i.id)
+        FROM users u
+        LEFT JOIN issues i
+          ON i.assigned_to_id = u.id AND i.status IN ('pending', 'in_progress')
+        WHERE u.role IN ('staff', 'admin', 'super_admin')
+           OR u.id IN (SELECT assigned_to_id FROM issues)
+        GROUP BY u.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_staff_workload_open_count_user_id', table_name='staff_workload')
+    op.drop_table('staff_workload')
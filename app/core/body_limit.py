@@ -0,0 +1,83 @@
+# app/core/body_limit.py
+"""
+ASGI middleware capping request body size.
+
+Requests announcing a larger Content-Length are refused before any of the
+body is read; chunked / unannounced bodies are counted as they stream in
+and cut off with 413 as soon as they cross the limit, so the multipart
+parser never buffers more than the cap.
+"""
+import json
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    def __init__(self, app, default_limit: int, limits: dict[tuple[str, str], int] | None = None):
+        """`limits` maps (METHOD, path) to a per-route cap overriding `default_limit`."""
+        self.app = app
+        self.default_limit = default_limit
+        self.limits = limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        path = scope["path"].rstrip("/") or "/"
+        limit = self.limits.get((scope["method"], path), self.default_limit)
+
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            return await self._reject(send, limit)
+
+        received = 0
+        exceeded = False
+        started = False
+        responded = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            # The app may turn BodyTooLarge into its own error response
+            # (FastAPI reports body parsing failures as 400); answer 413 instead.
+            nonlocal started, responded
+            if not exceeded or started:
+                if message["type"] == "http.response.start":
+                    started = True
+                return await send(message)
+            if message["type"] == "http.response.start" and not responded:
+                responded = True
+                await self._reject(send, limit)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except BodyTooLarge:
+            if started:
+                raise
+        if exceeded and not started and not responded:
+            await self._reject(send, limit)
+
+    async def _reject(self, send, limit: int):
+        body = json.dumps({"detail": f"Request body exceeds {limit} bytes"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
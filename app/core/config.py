@@ -38,6 +38,11 @@ class Settings(BaseSettings):
     - VAPID_PUBLIC_KEY=your-vapid-public-key
     - SUPABASE_URL=https://your-project.supabase.co
     - SUPABASE_SERVICE_ROLE=your-service-role-key
+    - STORAGE_BACKEND=supabase (or filesystem) - default: supabase when configured, else filesystem
+    - MEDIA_ROOT=media (directory for the filesystem backend)
+    - MEDIA_BASE_URL=/media (public URL prefix for filesystem photos; use the API's absolute URL if the frontend is on another origin)
+    - RESPONSE_CACHE_URL=redis://localhost:6379/0 (share the list/map response cache across workers)
+    - RESPONSE_CACHE_TTL=30 (seconds)
     """
     database_url: str = Field(..., alias="DATABASE_URL")
     jwt_secret: str = Field(..., alias="JWT_SECRET")
@@ -67,6 +72,13 @@ class Settings(BaseSettings):
     supabase_service_role: Optional[str] = Field(default=None, alias="SUPABASE_SERVICE_ROLE")
     supabase_bucket: str = Field(default="issue-photos", alias="SUPABASE_BUCKET")
 
+    storage_backend: Optional[str] = Field(default=None, alias="STORAGE_BACKEND")
+    media_root: str = Field(default="media", alias="MEDIA_ROOT")
+    media_base_url: str = Field(default="/media", alias="MEDIA_BASE_URL")
+
+    response_cache_url: Optional[str] = Field(default=None, alias="RESPONSE_CACHE_URL")
+    response_cache_ttl: float = Field(default=30, alias="RESPONSE_CACHE_TTL")
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,21 @@
+# app/core/pagination.py
+"""Opaque keyset cursors: base64url-encoded (timestamp, tiebreaker) pairs."""
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+
+
+def encode_cursor(at: datetime, key) -> str:
+    raw = json.dumps([at.isoformat(), key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, object]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        at, key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(at), key
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -9,21 +9,32 @@ from slowapi import _rate_limit_exceeded_handler
 
 from app.core.config import cors_origins_list, settings
 from app.core.ratelimit import limiter
+from app.core.body_limit import BodySizeLimitMiddleware
 from app.routers import auth, issues, settings as settings_router, issue_types, bot, issues_stats
 from app.routers import regions, push_subscriptions
 from app.routers import public_issue_types
 from app.routers import admin_users
+from app.routers import media
+from app.routers import notification_preferences
 
 app = FastAPI(title="Improve My City API")
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Cap request bodies while they stream in; only report creation carries photos
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    default_limit=1024 * 1024,
+    limits={("POST", "/issues"): issues.MAX_CREATE_BODY},
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins_list(),
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 @app.get("/health")
@@ -39,4 +50,6 @@ app.include_router(issues_stats.router)
 app.include_router(regions.router)
 app.include_router(push_subscriptions.router)
 app.include_router(public_issue_types.router)
-app.include_router(admin_users.router)
\ No newline at end of file
+app.include_router(admin_users.router)
+app.include_router(media.router)
+app.include_router(notification_preferences.router)
\ No newline at end of file
@@ -2,7 +2,7 @@
 # Project: improve-my-city-backend
 # Auto-added for reference
 
-from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy import Integer, String, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
 
@@ -13,4 +13,18 @@ class IssueAttachment(Base):
     issue_id: Mapped[int] = mapped_column(ForeignKey("issues.id", ondelete="CASCADE"), index=True)
     url: Mapped[str] = mapped_column(String(500))
     content_type: Mapped[str] = mapped_column(String(100))
-    size: Mapped[int] = mapped_column(Integer)
\ No newline at end of file
+    size: Mapped[int] = mapped_column(Integer)
+
+class IssueAttachmentVariant(Base):
+    """EXIF-free WebP renditions of an attachment (see app/services/images.py)."""
+    __tablename__ = "issue_attachment_variants"
+    __table_args__ = (UniqueConstraint("attachment_id", "kind", name="uq_attachment_variant_kind"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    attachment_id: Mapped[int] = mapped_column(ForeignKey("issue_attachments.id", ondelete="CASCADE"), index=True)
+    kind: Mapped[str] = mapped_column(String(20))  # "display", "thumb_480", "thumb_160"
+    url: Mapped[str] = mapped_column(String(500))
+    content_type: Mapped[str] = mapped_column(String(100))
+    width: Mapped[int] = mapped_column(Integer)
+    height: Mapped[int] = mapped_column(Integer)
+    size: Mapped[int] = mapped_column(Integer)
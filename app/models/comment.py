@@ -0,0 +1,18 @@
+# File: app/models/comment.py
+# Project: improve-my-city-backend
+
+from sqlalchemy import Index, Text, DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class IssueComment(Base):
+    __tablename__ = "issue_comments"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    issue_id: Mapped[int] = mapped_column(ForeignKey("issues.id", ondelete="CASCADE"), nullable=False)
+    user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+# Serves per-issue listing / keyset pagination in both directions
+Index("ix_issue_comments_issue_id_created_at", IssueComment.issue_id, IssueComment.created_at, IssueComment.id)
@@ -1,9 +1,12 @@
 # File: app/models/issue.py
 from __future__ import annotations
 from enum import Enum as PyEnum
-from sqlalchemy import String, Float, Enum, Integer, DateTime, ForeignKey, func, Index
+from sqlalchemy import String, Float, Enum, Integer, BigInteger, DateTime, ForeignKey, func, Index, event, Computed, inspect
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
+from app.services.geo import cell_for
+from app.models.staff_workload import adjust_workload
 
 class IssueStatus(PyEnum):
     pending = "pending"
@@ -17,14 +20,17 @@ class Issue(Base):
     title: Mapped[str] = mapped_column(String(200), index=True)
     description: Mapped[str | None] = mapped_column(String(4000), nullable=True)
     category: Mapped[str | None] = mapped_column(String(120), index=True, nullable=True)
-    status: Mapped[IssueStatus] = mapped_column(Enum(IssueStatus), default=IssueStatus.pending, index=True)
+    # active_history: the previous status/assignee are needed to keep staff_workload in sync
+    status: Mapped[IssueStatus] = mapped_column(Enum(IssueStatus), default=IssueStatus.pending, index=True, active_history=True)
 
     lat: Mapped[float | None] = mapped_column(Float, nullable=True)
     lng: Mapped[float | None] = mapped_column(Float, nullable=True)
     address: Mapped[str | None] = mapped_column(String(300), nullable=True)
+    # fixed-grid spatial key, kept in sync with lat/lng (see app/services/geo.py)
+    geo_cell: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
 
     created_by_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
-    assigned_to_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), index=True, nullable=True)
+    assigned_to_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), index=True, nullable=True, active_history=True)
 
     country: Mapped[str | None] = mapped_column(String(2), index=True, nullable=True)
     state_code: Mapped[str | None] = mapped_column(String(3), index=True, nullable=True)
@@ -35,4 +41,73 @@ class Issue(Base):
     in_progress_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True))
     resolved_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True))
 
-Index("ix_issues_lat_lng", Issue.lat, Issue.lng)
\ No newline at end of file
+    # bumped on status/assignment/comment/attachment changes; drives ETags
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1", nullable=False)
+
+    # generated full-text document, see app/services/search.py
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(address, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+Index("ix_issues_lat_lng", Issue.lat, Issue.lng)
+Index("ix_issues_created_at_id", Issue.created_at.desc(), Issue.id.desc())
+Index("ix_issues_search_vector", Issue.search_vector, postgresql_using="gin")
+Index("ix_issues_title_trgm", Issue.title, postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"})
+Index("ix_issues_address_trgm", Issue.address, postgresql_using="gin", postgresql_ops={"address": "gin_trgm_ops"})
+
+
+@event.listens_for(Issue, "before_insert")
+@event.listens_for(Issue, "before_update")
+def _sync_geo_cell(mapper, connection, target: Issue):
+    target.geo_cell = cell_for(target.lat, target.lng)
+
+
+OPEN_STATUSES = (IssueStatus.pending, IssueStatus.in_progress)
+
+
+def _workload_owner(status, assigned_to_id):
+    """User whose open count this issue contributes to, if any."""
+    if assigned_to_id is None or status is None:
+        return None
+    return assigned_to_id if IssueStatus(getattr(status, "value", status)) in OPEN_STATUSES else None
+
+
+@event.listens_for(Issue, "after_insert")
+def _workload_on_insert(mapper, connection, target: Issue):
+    owner = _workload_owner(target.status or IssueStatus.pending, target.assigned_to_id)
+    if owner:
+        adjust_workload(connection, {owner: 1})
+
+
+@event.listens_for(Issue, "after_update")
+def _workload_on_update(mapper, connection, target: Issue):
+    attrs = inspect(target).attrs
+    status, assigned = attrs.status.history, attrs.assigned_to_id.history
+    if not (status.has_changes() or assigned.has_changes()):
+        return
+    old = _workload_owner(
+        status.deleted[0] if status.deleted else target.status,
+        assigned.deleted[0] if assigned.deleted else target.assigned_to_id,
+    )
+    new = _workload_owner(target.status, target.assigned_to_id)
+    if old != new:
+        deltas = {}
+        if old:
+            deltas[old] = -1
+        if new:
+            deltas[new] = deltas.get(new, 0) + 1
+        adjust_workload(connection, deltas)
+
+
+@event.listens_for(Issue, "before_delete")
+def _workload_on_delete(mapper, connection, target: Issue):
+    owner = _workload_owner(target.status, target.assigned_to_id)
+    if owner:
+        adjust_workload(connection, {owner: -1})
@@ -0,0 +1,17 @@
+# File: app/models/notification_digest.py
+from sqlalchemy import String, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class NotificationDigestItem(Base):
+    """An email held back for a recipient's next digest (see app/services/notifications.py)."""
+    __tablename__ = "notification_digest_items"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    template: Mapped[str] = mapped_column(String(40), nullable=False)
+    args: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+Index("ix_notification_digest_items_to_email_created_at", NotificationDigestItem.to_email, NotificationDigestItem.created_at)
@@ -0,0 +1,34 @@
+# File: app/models/notification_outbox.py
+from sqlalchemy import Integer, String, Text, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class NotificationOutbox(Base):
+    """
+    Pending notification work, written in the same transaction as the change
+    that caused it and drained by app/workers/notifications.py.
+
+    Rows are either events ("issue_created", "issue_status", ...) that the
+    worker expands into one row per delivery, or deliveries ("email", "push").
+    """
+    __tablename__ = "notification_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(40), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default="pending", server_default="pending", nullable=False)  # pending / sent / dead
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    # next time the row may be claimed: retry backoff, or the lease of the worker holding it
+    available_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at: Mapped["DateTime | None"] = mapped_column(DateTime(timezone=True), nullable=True)
+
+# Only pending rows are ever scanned
+Index(
+    "ix_notification_outbox_pending",
+    NotificationOutbox.available_at,
+    NotificationOutbox.id,
+    postgresql_where=NotificationOutbox.status == "pending",
+)
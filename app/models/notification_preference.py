@@ -0,0 +1,27 @@
+# File: app/models/notification_preference.py
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, func, true
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class NotificationPreference(Base):
+    """
+    Per-user notification settings; users without a row get the defaults
+    (email and push on, no watching).
+
+    `watch_all_comments` lets admins / super admins opt in to comments on
+    issues they neither reported nor are assigned to.
+    """
+    __tablename__ = "notification_preferences"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    email_enabled: Mapped[bool] = mapped_column(Boolean, default=True, server_default="true", nullable=False)
+    push_enabled: Mapped[bool] = mapped_column(Boolean, default=True, server_default="true", nullable=False)
+    watch_all_comments: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false", nullable=False)
+    updated_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+# Watchers are looked up on every comment; they are few
+Index(
+    "ix_notification_preferences_watchers",
+    NotificationPreference.user_id,
+    postgresql_where=NotificationPreference.watch_all_comments == true(),
+)
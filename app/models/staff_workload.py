@@ -0,0 +1,37 @@
+# File: app/models/staff_workload.py
+from sqlalchemy import Integer, DateTime, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class StaffWorkload(Base):
+    """Open (pending / in_progress) issues assigned to each user, maintained incrementally."""
+    __tablename__ = "staff_workload"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    open_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    updated_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+Index("ix_staff_workload_open_count_user_id", StaffWorkload.open_count, StaffWorkload.user_id)
+
+
+def adjust_workload(connection, deltas: dict[int, int]):
+    """
+    Apply {user_id: +/-n} to open counts in the caller's transaction.
+
+    Users are updated in id order so concurrent adjustments cannot deadlock;
+    counts never go below zero (scripts/reconcile_workload.py repairs drift).
+    """
+    for user_id in sorted(u for u, d in deltas.items() if u is not None and d):
+        delta = deltas[user_id]
+        connection.execute(
+            insert(StaffWorkload)
+            .values(user_id=user_id, open_count=max(delta, 0))
+            .on_conflict_do_update(
+                index_elements=[StaffWorkload.user_id],
+                set_={
+                    "open_count": func.greatest(StaffWorkload.open_count + delta, 0),
+                    "updated_at": func.now(),
+                },
+            )
+        )
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.db.session import get_db
 from app.core.security import require_role, get_current_user
+from app.services.assignment import region_index
 
 router = APIRouter(prefix="/admin/users", tags=["admin-users"])
 
@@ -95,6 +96,7 @@ def create_user(payload: dict = Body(...), db: Session = Depends(get_db)):
       values (:uid, :sc)
     """), {"uid": user_id, "sc": region})
   db.commit()
+  region_index.invalidate()
   return {"ok": True}
 
 @router.put("/{user_id}", dependencies=[Depends(require_role("admin","super_admin","staff"))])
@@ -140,6 +142,7 @@ def update_admin_user(user_id:int, payload:dict=Body(...), db:Session=Depends(ge
   params = {"id": user_id, **update_data}
   db.execute(text(f"update users set {', '.join(sets)} where id=:id"), params)
   db.commit()
+  region_index.invalidate()
   return {"ok": True}
 
 @router.delete("/{user_id}", dependencies=[Depends(require_role("admin","super_admin"))])
@@ -168,6 +171,7 @@ def delete_admin_user(user_id:int, db:Session=Depends(get_db), me=Depends(get_cu
   
   db.execute(text("delete from users where id=:id"), {"id": user_id})
   db.commit()
+  region_index.invalidate()
   return {"ok": True}
 
 @router.post("/{user_id}/reset-password", dependencies=[Depends(require_role("admin","super_admin","staff"))])
@@ -241,10 +245,12 @@ def bulk_user_operations(payload: dict = Body(...), db: Session = Depends(get_db
     if operation == "activate":
         db.execute(text("update users set is_active=true where id=any(:ids)"), {"ids": user_ids})
         db.commit()
+        region_index.invalidate()
         return {"ok": True, "updated_count": len(user_ids)}
     elif operation == "deactivate":
         db.execute(text("update users set is_active=false where id=any(:ids) and role != 'super_admin'"), {"ids": user_ids})
         db.commit()
+        region_index.invalidate()
         return {"ok": True, "updated_count": len(user_ids)}
     elif operation == "delete":
         # Check for transactional records before deletion
@@ -256,6 +262,7 @@ def bulk_user_operations(payload: dict = Body(...), db: Session = Depends(get_db
         
         db.execute(text("delete from users where id=any(:ids) and role = 'citizen'"), {"ids": user_ids})
         db.commit()
+        region_index.invalidate()
         return {"ok": True, "updated_count": len(user_ids)}
     else:
         raise HTTPException(400, "Invalid operation")
\ No newline at end of file
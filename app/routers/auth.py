@@ -137,8 +137,8 @@ def forgot(body: EmailOnly, db: Session = Depends(get_db)):
             send_reset_password(user.email, make_email_token(user.email, "reset"))
         except Exception as e:
             import logging
+            # same response either way, so a failing mail provider does not reveal which emails have accounts
             logging.error(f"Failed to send reset password email: {e}", exc_info=True)
-            raise HTTPException(status_code=500, detail="Failed to send reset password email. Please try again later.")
     return {"ok": True, "message": "If an account exists with this email, a password reset link has been sent."}
 
 @router.post("/reset")
@@ -181,8 +181,9 @@ def send_verify(email: str, db: Session = Depends(get_db)):
         return {"ok": True, "message": "Verification email sent. Check your inbox for the code and link."}
     except Exception as e:
         import logging
+        # same response as for unknown emails, so a failing mail provider does not reveal accounts
         logging.error(f"Failed to send verification email: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to send verification email. Please try again later.")
+        return {"ok": True, "message": "If an account exists with this email, a verification email has been sent."}
 
 @router.post("/verify-code")
 def verify_code(email: str, code: str, db: Session = Depends(get_db)):
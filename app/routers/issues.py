@@ -1,321 +1,156 @@
 # File: app/routers/issues.py
 from fastapi import APIRouter, Depends, Query, HTTPException, UploadFile, File, Request, Form, BackgroundTasks
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional, Union
+from typing import List, Literal, Optional, Union
 from app.db.session import get_db, SessionLocal
-from app.models.issue import Issue, IssueStatus
+from app.models.issue import Issue, IssueStatus, OPEN_STATUSES
+from app.models.staff_workload import adjust_workload
 from app.schemas.issue import (
     IssueOut,
     PaginatedIssuesOut,
     DuplicateIssueResponse,
     IssueUpdate,
+    IssueClustersOut,
+    UploadTargetsIn,
+    UploadTargetsOut,
+    UploadFinalizeIn,
 )
 from app.core.ratelimit import limiter
-from app.models.attachment import IssueAttachment
+from app.models.attachment import IssueAttachment, IssueAttachmentVariant
 from app.models.issue_activity import IssueActivity, ActivityKind
-from app.services.storage import upload_image, make_object_key
-from app.models.region import StaffRegion
+from app.models.comment import IssueComment
+from app.services import storage
+from app.services.storage import upload_many, make_object_key, sniff_image_type, UploadError
+from app.services.geo import find_within, nearest, cluster_size_deg, POINTS_MIN_ZOOM
+from app.services.search import search_filter, search_rank
+from app.services.images import generate_variants_safe, DETAIL_VARIANT
+from app.services.assignment import (
+    engine as assignment_engine,
+    strategy_from_settings,
+    STRATEGIES as ASSIGNMENT_STRATEGIES,
+)
+from app.services.issue_read import issue_list_select, issue_rows_to_items, dump_json
+from app.services.timeline import timeline_select, timeline_key
+from app.services.etag import (
+    bump_issue_version,
+    issue_version,
+    issue_etag,
+    list_etag,
+    viewer_key,
+    etag_matches,
+    set_etag,
+    not_modified,
+)
+from app.services import response_cache
+from app.services import notifications
 from app.models.user import User, UserRole
-from app.core.security import get_current_user, get_optional_user
-from sqlalchemy import text
+from app.core.security import get_current_user, get_optional_user, require_role
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.cache import TTLCache
+from sqlalchemy import (
+    text,
+    tuple_,
+    select,
+    update,
+    delete,
+    insert,
+    bindparam,
+    column,
+    any_,
+    func,
+    Integer,
+    values as sa_values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from datetime import datetime, timezone
+import json
+import logging
+import re
 
 router = APIRouter(prefix="/issues", tags=["issues"])
 
 MAX_FILES = 10
+BULK_CHUNK = 2000
+OBJECT_KEY_RE = re.compile(r"^\d+/[0-9a-f]{32}\.[a-z0-9]{1,10}$")
+MAX_MAP_POINTS = 2000
+EXPORT_BATCH = 1000
+EXPORT_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "category",
+    "status",
+    "lat",
+    "lng",
+    "address",
+    "country",
+    "state_code",
+    "created_at",
+    "updated_at",
+    "in_progress_at",
+    "resolved_at",
+    "created_by_id",
+    "creator_name",
+    "creator_email",
+    "assigned_to_id",
+    "assignee_name",
+    "assignee_email",
+    "photo_count",
+]
 MAX_BYTES = 2 * 1024 * 1024
 ALLOWED = {"image/jpeg", "image/png", "image/webp", "image/gif"}
+UPLOAD_CHUNK = 64 * 1024
+# whole create_issue form: every photo at the cap plus the text fields
+MAX_CREATE_BODY = MAX_FILES * MAX_BYTES + 256 * 1024
 
+# list_issues total counts
+COUNT_CAP = 10000
+ESTIMATE_EXACT_BELOW = 1000
+_count_cache = TTLCache(maxsize=1024, ttl=30)
 
-def _get_issue_photos(db: Session, issue_id: int) -> list[str]:
-    """Helper to fetch photos for an issue."""
-    return [a.url for a in db.query(IssueAttachment).filter_by(issue_id=issue_id).all()]
-
-def _send_assignment_notifications_safe(
-    issue_id: int, assigned_id: int | None, assigner_id: int, old_assigned_id: int | None):
-    db = SessionLocal()
-    try:
-        # Send assignment notification email and push
-        from app.services.notify_email import send_assignment_notification
-        from app.services.notify_push import send_push
-        from app.models.push import PushSubscription
-
-        settings = _get_app_settings(db)
-        auto_email = (
-            getattr(settings, "auto_email_on_status_change", True)
-            if settings
-            else True
-        )
-        push_enabled = (
-            getattr(settings, "push_notifications_enabled", False)
-            if settings
-            else False
-        )
-
-        if assigned_id != old_assigned_id:
-            assigned_user = (
-                db.query(User)
-                .filter(User.id == assigned_id)
-                .first()
-            )
-            current_user = db.query(User).filter(User.id == assigner_id).first()
-            issue = db.query(Issue).filter(Issue.id == issue_id).first()
-            if assigned_user:
-                assigner_name = (
-                    current_user.name
-                    or current_user.email
-                    or "Admin"
-                )
-
-                # Send email
-                if auto_email and assigned_user.email:
-                    try:
-                        send_assignment_notification(
-                            assigned_user.email,
-                            issue.id,
-                            issue.title,
-                            assigner_name,
-                        )
-                    except Exception:
-                        pass
-
-                # Send push notification
-                if push_enabled:
-                    subs = (
-                        db.query(PushSubscription)
-                        .filter(
-                            PushSubscription.user_id == assigned_user.id
-                        )
-                        .all()
-                    )
-                    for s in subs:
-                        try:
-                            send_push(
-                                {
-                                    "endpoint": s.endpoint,
-                                    "keys": {
-                                        "p256dh": s.p256dh,
-                                        "auth": s.auth,
-                                    },
-                                },
-                                {
-                                    "title": "Issue Assigned",
-                                    "body": (
-                                        f"Issue #{issue.id} "
-                                        f"assigned to you by {assigner_name}"
-                                    ),
-                                },
-                            )
-                        except Exception:
-                            pass
-    except Exception as e:
-        import logging
-        logging.error(f"Error in background assignment notifications: {e}", exc_info=True)
-    finally:
-        db.close()
-
-
-def _send_comment_notifications_safe(issue_id: int, comment_author_id: int, comment_body: str = ""):
-    db = SessionLocal()
-    try:
-        from app.services.notify_email import send_comment_notification
-        from app.services.notify_push import send_push
-        from app.models.push import PushSubscription
-
-        settings = _get_app_settings(db)
-        auto_email = (
-            getattr(settings, "auto_email_on_status_change", True)
-            if settings
-            else True
-        )
-        push_enabled = (
-            getattr(settings, "push_notifications_enabled", False)
-            if settings
-            else False
-        )
-
-        issue = db.query(Issue).filter(Issue.id == issue_id).first()
-        if not issue:
-            return
-
-        comment_author = db.query(User).filter(User.id == comment_author_id).first()
-        if not comment_author:
-            return
 
-        comment_author_name = comment_author.name or comment_author.email or "Anonymous"
-        
-        if not comment_body:
-            from sqlalchemy import text
-            latest_comment = db.execute(
-                text(
-                    "SELECT body FROM issue_comments WHERE issue_id=:iid AND user_id=:uid ORDER BY created_at DESC LIMIT 1"
-                ),
-                {"iid": issue_id, "uid": comment_author_id},
-            ).scalar()
-            if latest_comment:
-                comment_body = latest_comment
-        
-        recipients = set()
-        recipient_users = []
-
-        if issue.created_by_id:
-            creator = db.query(User).filter(User.id == issue.created_by_id).first()
-            if creator and creator.email and creator.email != comment_author.email:
-                recipients.add(creator.email)
-                recipient_users.append(creator)
-
-        if issue.assigned_to_id:
-            assigned = db.query(User).filter(User.id == issue.assigned_to_id).first()
-            if assigned and assigned.email and assigned.email != comment_author.email:
-                recipients.add(assigned.email)
-                recipient_users.append(assigned)
-
-        admins = (
-            db.query(User)
-            .filter(User.role.in_([UserRole.admin, UserRole.super_admin]))
-            .all()
-        )
-        for admin in admins:
-            if admin.email and admin.email != comment_author.email:
-                recipients.add(admin.email)
-                if admin not in recipient_users:
-                    recipient_users.append(admin)
-
-        for recipient in recipient_users:
-            if auto_email and recipient.email:
-                try:
-                    send_comment_notification(
-                        recipient.email,
-                        issue.id,
-                        issue.title,
-                        comment_author_name,
-                        comment_body,
-                    )
-                except Exception:
-                    pass
-
-            if push_enabled:
-                subs = (
-                    db.query(PushSubscription)
-                    .filter(PushSubscription.user_id == recipient.id)
-                    .all()
-                )
-                for s in subs:
-                    try:
-                        send_push(
-                            {
-                                "endpoint": s.endpoint,
-                                "keys": {"p256dh": s.p256dh, "auth": s.auth},
-                            },
-                            {
-                                "title": "New Comment",
-                                "body": f"{comment_author_name} commented on issue #{issue.id}",
-                            },
-                        )
-                    except Exception:
-                        pass
-    except Exception as e:
-        import logging
-        logging.error(f"Error in background comment notifications: {e}", exc_info=True)
-    finally:
-        db.close()
+def _check_upload(f: UploadFile) -> tuple[str, int]:
+    """
+    Validate an uploaded image chunk by chunk: magic bytes first, then the
+    size cap, stopping at the first chunk past MAX_BYTES. Returns the sniffed
+    content type (the client's claim is not trusted) and the size; the file
+    is left rewound for streaming to storage.
+    """
+    f.file.seek(0)
+    chunk = f.file.read(UPLOAD_CHUNK)
+    content_type = sniff_image_type(chunk[:16])
+    if content_type not in ALLOWED:
+        raise HTTPException(status_code=400, detail="Unsupported image type")
+    size = len(chunk)
+    while chunk := f.file.read(UPLOAD_CHUNK):
+        size += len(chunk)
+        if size > MAX_BYTES:
+            raise HTTPException(status_code=400, detail="Image exceeds 2MB")
+    if size > MAX_BYTES:
+        raise HTTPException(status_code=400, detail="Image exceeds 2MB")
+    f.file.seek(0)
+    return content_type, size
 
 
-def _send_status_change_notifications_safe(issue_id: int, new_status: str, changer_id: int):
-    db = SessionLocal()
-    try:
-        from app.services.notify_email import send_status_update
-        from app.services.notify_push import send_push
-        from app.models.push import PushSubscription
-
-        settings = _get_app_settings(db)
-        send_emails = (
-            getattr(settings, "auto_email_on_status_change", True)
-            if settings
-            else True
+def _get_issue_photos(db: Session, issue_id: int) -> list[str]:
+    """Helper to fetch photos for an issue (EXIF-free display renditions once generated)."""
+    from sqlalchemy import and_, func as sa_func
+
+    rows = (
+        db.query(sa_func.coalesce(IssueAttachmentVariant.url, IssueAttachment.url))
+        .outerjoin(
+            IssueAttachmentVariant,
+            and_(
+                IssueAttachmentVariant.attachment_id == IssueAttachment.id,
+                IssueAttachmentVariant.kind == DETAIL_VARIANT,
+            ),
         )
-
-        issue = db.query(Issue).filter(Issue.id == issue_id).first()
-        if not issue:
-            return
-
-        if issue.created_by_id and send_emails:
-            creator = db.query(User).filter(User.id == issue.created_by_id).first()
-            if creator and creator.email:
-                try:
-                    send_status_update(creator.email, issue.id, new_status)
-                except Exception:
-                    pass
-                subs = (
-                    db.query(PushSubscription)
-                    .filter(PushSubscription.user_id == creator.id)
-                    .all()
-                )
-                for s in subs:
-                    try:
-                        send_push(
-                            {
-                                "endpoint": s.endpoint,
-                                "keys": {"p256dh": s.p256dh, "auth": s.auth},
-                            },
-                            {
-                                "title": "Improve My City",
-                                "body": f"Issue #{issue.id} is now {new_status.replace('_', ' ')}",
-                            },
-                        )
-                    except Exception:
-                        pass
-
-        if issue.assigned_to_id and send_emails and new_status in ["in_progress", "resolved"]:
-            assigned = db.query(User).filter(User.id == issue.assigned_to_id).first()
-            if assigned and assigned.email and assigned.id != issue.created_by_id:
-                try:
-                    send_status_update(assigned.email, issue.id, new_status)
-                except Exception:
-                    pass
-                subs = (
-                    db.query(PushSubscription)
-                    .filter(PushSubscription.user_id == assigned.id)
-                    .all()
-                )
-                for s in subs:
-                    try:
-                        send_push(
-                            {
-                                "endpoint": s.endpoint,
-                                "keys": {"p256dh": s.p256dh, "auth": s.auth},
-                            },
-                            {
-                                "title": "Improve My City",
-                                "body": f"Issue #{issue.id} is now {new_status.replace('_', ' ')}",
-                            },
-                        )
-                    except Exception:
-                        pass
-    except Exception as e:
-        import logging
-        logging.error(f"Error in background status change notifications: {e}", exc_info=True)
-    finally:
-        db.close()
-
-
-def _send_report_confirmation_safe(issue_id: int, creator_email: str):
-    db = SessionLocal()
-    try:
-        from app.services.notify_email import send_report_confirmation
-
-        issue = db.query(Issue).filter(Issue.id == issue_id).first()
-        if issue and creator_email:
-            try:
-                send_report_confirmation(creator_email, issue.id, issue.title)
-            except Exception:
-                pass
-    except Exception as e:
-        import logging
-        logging.error(f"Error in background report confirmation: {e}", exc_info=True)
-    finally:
-        db.close()
-
+        .filter(IssueAttachment.issue_id == issue_id)
+        .order_by(IssueAttachment.id)
+        .all()
+    )
+    return [r[0] for r in rows]
 
 def _get_app_settings(db: Session):
     """Helper to safely get AppSettings, handling missing columns."""
@@ -364,6 +199,180 @@ def _get_app_settings(db: Session):
         return None
 
 
+def _normalize_issue_filters(
+    status: Optional[IssueStatus] = None,
+    statuses: Optional[str] = None,
+    category: Optional[str] = None,
+    state_code: Optional[str] = None,
+    bbox: Optional[str] = None,
+    date_range: Optional[str] = None,
+    search: Optional[str] = None,
+    assigned_to_id: Optional[int] = None,
+    overdue: int = 0,
+    needs_attention: int = 0,
+    created_by_id: Optional[int] = None,
+) -> dict:
+    """
+    Validate list filters into a canonical, JSON-serializable dict.
+
+    Equal filter sets produce equal dicts, so the result doubles as a cache key.
+    """
+    status_values: list[str] = []
+    if statuses:
+        for s in statuses.split(","):
+            try:
+                status_values.append(IssueStatus(s.strip()).value)
+            except ValueError:
+                # ignore invalid values
+                pass
+    elif status:
+        status_values.append(status.value)
+
+    bbox_values = None
+    if bbox:
+        try:
+            bbox_values = [float(x) for x in bbox.split(",")]
+            if len(bbox_values) != 4:
+                raise ValueError(bbox)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid bbox format")
+
+    return {
+        "statuses": sorted(set(status_values)),
+        "category": category or None,
+        "state_code": state_code or None,
+        "bbox": bbox_values,
+        # "all_time" -> front-end simply does not send date_range
+        "date_range": date_range if date_range in ("7d", "30d", "90d") else None,
+        "search": search or None,
+        "assigned_to_id": assigned_to_id,
+        "overdue": bool(overdue),
+        "needs_attention": bool(needs_attention),
+        "created_by_id": created_by_id,
+    }
+
+
+def _apply_issue_filters(q, filters: dict):
+    """Apply a dict from _normalize_issue_filters to an Issue query or select()."""
+    from datetime import timedelta
+
+    now = datetime.utcnow()
+
+    # --------- STATUS FILTERING ---------
+    if filters["statuses"]:
+        q = q.filter(Issue.status.in_([IssueStatus(s) for s in filters["statuses"]]))
+
+    # Category / Region
+    if filters["category"]:
+        q = q.filter(Issue.category == filters["category"])
+    if filters["state_code"]:
+        q = q.filter(Issue.state_code == filters["state_code"])
+
+    # --------- DATE RANGE FILTER ---------
+    if filters["date_range"]:
+        days = {"7d": 7, "30d": 30, "90d": 90}[filters["date_range"]]
+        q = q.filter(Issue.created_at >= now - timedelta(days=days))
+
+    # --------- SEARCH (ID + FULL TEXT / TRIGRAM) ---------
+    if filters["search"]:
+        q = q.filter(search_filter(filters["search"]))
+
+    # --------- BBOX FILTER ---------
+    if filters["bbox"]:
+        min_lng, min_lat, max_lng, max_lat = filters["bbox"]
+        q = q.filter(
+            Issue.lng >= min_lng,
+            Issue.lng <= max_lng,
+            Issue.lat >= min_lat,
+            Issue.lat <= max_lat,
+        )
+
+    # --------- MINE ONLY (issues created by logged-in user) ---------
+    if filters["created_by_id"] is not None:
+        q = q.filter(Issue.created_by_id == filters["created_by_id"])
+
+    # --------- EXPLICIT ASSIGNED FILTER (dropdown / quick "assigned_to_me") ---------
+    if filters["assigned_to_id"] is not None:
+        if filters["assigned_to_id"] == 0:
+            # 0 means "Unassigned"
+            q = q.filter(Issue.assigned_to_id.is_(None))
+        else:
+            q = q.filter(Issue.assigned_to_id == filters["assigned_to_id"])
+
+    # --------- OVERDUE / NEEDS ATTENTION QUICK FILTERS ---------
+    if filters["overdue"]:
+        q = q.filter(
+            Issue.status.in_([IssueStatus.pending, IssueStatus.in_progress]),
+            Issue.created_at < now - timedelta(days=7),
+        )
+    if filters["needs_attention"]:
+        q = q.filter(
+            Issue.status.in_([IssueStatus.pending, IssueStatus.in_progress]),
+            Issue.assigned_to_id.is_(None),
+        )
+    return q
+
+
+def _count_issues(db: Session, q, filters: dict, strategy: str) -> tuple[int, bool]:
+    """
+    Total for a filtered issue query as (total, is_exact), per count strategy:
+
+    - exact: COUNT(*) over the filtered query
+    - estimated: planner row estimate via EXPLAIN, falling back to an exact
+      count when the estimate is small enough for counting to be cheap
+    - capped: counts at most COUNT_CAP rows; larger sets report COUNT_CAP ("10000+")
+
+    Approximate results are cached briefly per (strategy, normalized
+    filters). Exact ones are not, since writes do not invalidate the cache
+    and a stale total would still be reported as exact.
+    """
+    cache_key = (strategy, json.dumps(filters, sort_keys=True))
+    cached = _count_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = None
+    if strategy == "estimated":
+        try:
+            compiled = q.statement.compile(
+                dialect=db.get_bind().dialect,
+                compile_kwargs={"render_postcompile": True},
+            )
+            # raw driver params: unwrap enums the ORM would normally convert
+            params = {
+                k: v.value if isinstance(v, IssueStatus) else v for k, v in compiled.params.items()
+            }
+            plan = (
+                db.connection()
+                .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+                .scalar()
+            )
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+            if estimate >= ESTIMATE_EXACT_BELOW:
+                result = (estimate, False)
+        except Exception as e:
+            db.rollback()
+            import logging
+            logging.warning(f"Count estimate failed, using exact count: {e}")
+    elif strategy == "capped":
+        from sqlalchemy import func as sa_func
+
+        capped = (
+            db.query(sa_func.count())
+            .select_from(q.with_entities(Issue.id).limit(COUNT_CAP + 1).subquery())
+            .scalar()
+        )
+        result = (COUNT_CAP, False) if capped > COUNT_CAP else (capped, True)
+
+    if result is None:
+        result = (q.count(), True)
+    if not result[1]:
+        _count_cache.set(cache_key, result)
+    return result
+
+
 @router.post("", response_model=Union[IssueOut, DuplicateIssueResponse], status_code=201)
 @limiter.limit("10/minute")
 def create_issue(
@@ -393,6 +402,17 @@ def create_issue(
             detail="Address is required and must be at least 3 characters",
         )
 
+    # Validate images before anything is written
+    uploads = []
+    if files:
+        if len(files) > MAX_FILES:
+            raise HTTPException(
+                status_code=400, detail=f"Max {MAX_FILES} images"
+            )
+        for f in files:
+            content_type, size = _check_upload(f)
+            uploads.append((f.file, content_type, size))
+
     obj = Issue(
         title=title.strip(),
         description=description,
@@ -414,40 +434,21 @@ def create_issue(
         from datetime import timedelta
 
         two_hours_ago = datetime.utcnow() - timedelta(hours=2)
-        similar_issues = (
-            db.query(Issue)
-            .filter(
-                Issue.category == category,
-                Issue.created_at >= two_hours_ago,
-                Issue.lat.isnot(None),
-                Issue.lng.isnot(None),
-            )
-            .all()
+        recent_same_category = db.query(Issue).filter(
+            Issue.category == category,
+            Issue.created_at >= two_hours_ago,
         )
-
-        from math import radians, cos, sin, asin, sqrt
-
-        def haversine(lat1, lon1, lat2, lon2):
-            R = 6371000
-            lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-            a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-            c = 2 * asin(sqrt(a))
-            return R * c
-
-        for existing in similar_issues:
-            if existing.lat and existing.lng:
-                distance = haversine(obj.lat, obj.lng, existing.lat, existing.lng)
-                if distance <= 50:  # Within 50 meters
-                    return DuplicateIssueResponse(
-                        duplicate=True,
-                        existing_issue_id=existing.id,
-                        message=(
-                            f"A similar issue (#{existing.id}) was reported recently at this location. "
-                            "Would you like to view it instead?"
-                        ),
-                    )
+        nearby = find_within(recent_same_category, Issue, obj.lat, obj.lng, 50)
+        if nearby:
+            existing = nearby[0][0]
+            return DuplicateIssueResponse(
+                duplicate=True,
+                existing_issue_id=existing.id,
+                message=(
+                    f"A similar issue (#{existing.id}) was reported recently at this location. "
+                    "Would you like to view it instead?"
+                ),
+            )
 
     if auth:
         obj.created_by_id = auth.id
@@ -456,6 +457,8 @@ def create_issue(
     db.commit()
     db.refresh(obj)
     db.add(IssueActivity(issue_id=obj.id, kind=ActivityKind.created))
+    if obj.created_by_id and not uploads:
+        notifications.enqueue(db, "issue_created", issue_id=obj.id)
     db.commit()
 
     # Check auto-assign setting
@@ -464,101 +467,46 @@ def create_issue(
         getattr(settings, "auto_assign_issues", False) if settings else False
     )
 
-    from sqlalchemy import func as sa_func
-
     if auto_assign_enabled and obj.state_code:
-        # First try: staff assigned to this state, with least open issues
-        staff_with_counts = (
-            db.query(User.id, sa_func.count(Issue.id).label("open_count"))
-            .join(StaffRegion, StaffRegion.user_id == User.id)
-            .outerjoin(
-                Issue,
-                (Issue.assigned_to_id == User.id)
-                & (
-                    Issue.status.in_(
-                        [IssueStatus.pending, IssueStatus.in_progress]
-                    )
-                ),
-            )
-            .filter(
-                User.role == UserRole.staff,
-                User.is_active.is_(True),
-                StaffRegion.state_code == obj.state_code,
-            )
-            .group_by(User.id)
-            .order_by(sa_func.count(Issue.id).asc(), User.id.asc())
-            .limit(1)
-            .first()
-        )
-        if staff_with_counts:
-            obj.assigned_to_id = staff_with_counts[0]
-        else:
-            # Second try: admin (excluding super_admin) with least open issues
-            admin_with_counts = (
-                db.query(User.id, sa_func.count(Issue.id).label("open_count"))
-                .outerjoin(
-                    Issue,
-                    (Issue.assigned_to_id == User.id)
-                    & (
-                        Issue.status.in_(
-                            [IssueStatus.pending, IssueStatus.in_progress]
-                        )
-                    ),
-                )
-                .filter(
-                    User.role == UserRole.admin,
-                    User.is_active.is_(True),
-                )
-                .group_by(User.id)
-                .order_by(sa_func.count(Issue.id).asc(), User.id.asc())
-                .limit(1)
-                .first()
-            )
-            if admin_with_counts:
-                obj.assigned_to_id = admin_with_counts[0]
-            else:
-                # Third try: any super_admin
-                super_admin = (
-                    db.query(User)
-                    .filter(
-                        User.role == UserRole.super_admin,
-                        User.is_active.is_(True),
-                    )
-                    .first()
-                )
-                if super_admin:
-                    obj.assigned_to_id = super_admin.id
-        if auto_assign_enabled:
+        # Regional staff, else admins, else super admins (app/services/assignment.py)
+        assignee_id = assignment_engine.assign(db, obj, strategy_from_settings(settings))
+        if assignee_id is not None:
+            obj.assigned_to_id = assignee_id
             db.commit()
 
-    # images
-    if files:
-        if len(files) > MAX_FILES:
+    # images: uploaded concurrently; if any fails the report is rolled back
+    if uploads:
+        items = [
+            (fileobj, content_type, make_object_key(obj.id, content_type))
+            for fileobj, content_type, _ in uploads
+        ]
+        try:
+            urls = upload_many(items)
+        except UploadError as e:
+            logging.error(f"Photo upload failed for issue #{obj.id}, rolling back: {e}")
+            db.delete(obj)
+            db.commit()
             raise HTTPException(
-                status_code=400, detail=f"Max {MAX_FILES} images"
+                status_code=502, detail="Failed to store photos, please try again"
             )
-        for f in files:
-            if f.content_type not in ALLOWED:
-                raise HTTPException(
-                    status_code=400, detail="Unsupported image type"
-                )
-            data = f.file.read()
-            if len(data) > MAX_BYTES:
-                raise HTTPException(
-                    status_code=400, detail="Image exceeds 2MB"
-                )
-            key = make_object_key(obj.id, f.filename or "upload.jpg")
-            url = upload_image(data, f.content_type, key)
-            db.add(
-                IssueAttachment(
-                    issue_id=obj.id,
-                    url=url,
-                    content_type=f.content_type,
-                    size=len(data),
-                )
+        attachments = [
+            IssueAttachment(
+                issue_id=obj.id,
+                url=url,
+                content_type=content_type,
+                size=size,
             )
+            for (_, content_type, size), url in zip(uploads, urls)
+        ]
+        db.add_all(attachments)
+        if obj.created_by_id:
+            # confirm only once the photos are stored (a failed upload deletes the report)
+            notifications.enqueue(db, "issue_created", issue_id=obj.id)
+        bump_issue_version(db, obj.id)
         db.commit()
+        background_tasks.add_task(generate_variants_safe, [a.id for a in attachments])
 
+    response_cache.invalidate()
     photos = _get_issue_photos(db, obj.id)
     issue_dict = {
         "id": obj.id,
@@ -574,15 +522,6 @@ def create_issue(
     out = IssueOut.model_validate(issue_dict)
     out.photos = photos
 
-    if obj.created_by_id:
-        creator = db.query(User).filter(User.id == obj.created_by_id).first()
-        if creator and creator.email:
-            background_tasks.add_task(
-                _send_report_confirmation_safe,
-                issue_id=obj.id,
-                creator_email=creator.email,
-            )
-
     return out
 
 
@@ -602,6 +541,12 @@ def list_issues(
     ),
     limit: int = Query(default=20, ge=1, le=10000),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(
+        default=None, description="Opaque next_cursor from a previous page; overrides offset"
+    ),
+    count: Literal["exact", "estimated", "capped"] = Query(
+        default="exact", description="How `total` is computed"
+    ),
     mine_only: int = Query(default=0, ge=0, le=1),
     date_range: Optional[str] = Query(default=None),
     search: Optional[str] = Query(default=None),
@@ -610,241 +555,338 @@ def list_issues(
     needs_attention: int = Query(default=0, ge=0, le=1),
     auth=Depends(get_optional_user),
 ):
-    from datetime import timedelta
-
-    q = db.query(Issue)
-    now = datetime.utcnow()
-
-    # --------- STATUS FILTERING ---------
-    if statuses:
-        status_list = [s.strip() for s in statuses.split(",") if s.strip()]
-        if status_list:
-            valid_statuses = []
-            for s in status_list:
-                try:
-                    valid_statuses.append(IssueStatus(s))
-                except ValueError:
-                    # ignore invalid values
-                    pass
-            if valid_statuses:
-                q = q.filter(Issue.status.in_(valid_statuses))
-    elif status:
-        q = q.filter(Issue.status == status)
-
-    # Category / Region
-    if category:
-        q = q.filter(Issue.category == category)
-    if state_code:
-        q = q.filter(Issue.state_code == state_code)
-
-    # --------- DATE RANGE FILTER ---------
-    if date_range:
-        if date_range == "7d":
-            since = now - timedelta(days=7)
-            q = q.filter(Issue.created_at >= since)
-        elif date_range == "30d":
-            since = now - timedelta(days=30)
-            q = q.filter(Issue.created_at >= since)
-        elif date_range == "90d":
-            since = now - timedelta(days=90)
-            q = q.filter(Issue.created_at >= since)
-        # "all_time" → front-end simply does not send date_range
-
-    # --------- SEARCH (ID + TEXT FIELDS) ---------
-    if search:
-        search_term = f"%{search}%"
-        if search.isdigit():
-            q = q.filter(
-                (Issue.id == int(search))
-                | Issue.title.ilike(search_term)
-                | Issue.description.ilike(search_term)
-                | Issue.address.ilike(search_term)
-            )
-        else:
-            q = q.filter(
-                Issue.title.ilike(search_term)
-                | Issue.description.ilike(search_term)
-                | Issue.address.ilike(search_term)
-            )
-
-    # --------- BBOX FILTER ---------
-    if bbox:
-        try:
-            min_lng, min_lat, max_lng, max_lat = [
-                float(x) for x in bbox.split(",")
-            ]
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid bbox format")
-        q = q.filter(
-            Issue.lng >= min_lng,
-            Issue.lng <= max_lng,
-            Issue.lat >= min_lat,
-            Issue.lat <= max_lat,
-        )
-
-    # --------- MINE ONLY (issues created by logged-in user) ---------
-    if mine_only and auth:
-        q = q.filter(Issue.created_by_id == auth.id)
-
-    # --------- EXPLICIT ASSIGNED FILTER (dropdown / quick "assigned_to_me") ---------
-    if assigned_to_id is not None:
-        if assigned_to_id == 0:
-            # 0 means "Unassigned"
-            q = q.filter(Issue.assigned_to_id.is_(None))
-        else:
-            q = q.filter(Issue.assigned_to_id == assigned_to_id)
+    filters = _normalize_issue_filters(
+        status=status,
+        statuses=statuses,
+        category=category,
+        state_code=state_code,
+        bbox=bbox,
+        date_range=date_range,
+        search=search,
+        assigned_to_id=assigned_to_id,
+        overdue=overdue,
+        needs_attention=needs_attention,
+        created_by_id=auth.id if mine_only and auth else None,
+    )
+    q = _apply_issue_filters(db.query(Issue), filters)
 
-    # --------- OVERDUE / NEEDS ATTENTION QUICK FILTERS ---------
-    if overdue:
-        seven_days_ago = now - timedelta(days=7)
-        q = q.filter(
-            Issue.status.in_(
-                [IssueStatus.pending, IssueStatus.in_progress]
-            ),
-            Issue.created_at < seven_days_ago,
+    # --------- RESPONSE CACHE ---------
+    cache_key, cached = response_cache.lookup(
+        "issues",
+        {
+            "filters": filters,
+            "limit": limit,
+            "offset": offset,
+            "cursor": cursor,
+            "count": count,
+            "viewer": viewer_key(auth),
+        },
+    )
+    if cached:
+        body, etag = cached
+        if etag and etag_matches(request, etag):
+            return not_modified(etag)
+        response = Response(content=body, media_type="application/json")
+        if etag:
+            set_etag(response, etag)
+        return response
+
+    # --------- CONDITIONAL GET ---------
+    # Weak ETag from one aggregate over the filtered set, which also yields the
+    # exact total. Estimated/capped counts skip it: they exist to avoid full scans.
+    etag = None
+    if count == "exact":
+        from sqlalchemy import func as sa_func
+
+        total_count, last_updated, version_sum = q.with_entities(
+            sa_func.count(Issue.id), sa_func.max(Issue.updated_at), sa_func.sum(Issue.version)
+        ).one()
+        total_exact = True
+        etag = list_etag(
+            {
+                "filters": filters,
+                "limit": limit,
+                "offset": offset,
+                "cursor": cursor,
+                "viewer": viewer_key(auth),
+            },
+            [total_count, last_updated, version_sum],
         )
-    if needs_attention:
-        q = q.filter(
-            Issue.status.in_(
-                [IssueStatus.pending, IssueStatus.in_progress]
-            ),
-            Issue.assigned_to_id.is_(None),
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    else:
+        total_count, total_exact = _count_issues(db, q, filters, count)
+
+    # --------- PAGINATION (keyset cursor or legacy offset) ---------
+    # Searches are ranked by relevance unless the client is walking a cursor
+    page = _apply_issue_filters(issue_list_select(), filters)
+    by_relevance = bool(filters["search"]) and not cursor
+    if by_relevance:
+        page = page.order_by(
+            search_rank(filters["search"]).desc(), Issue.created_at.desc(), Issue.id.desc()
         )
-
-    total_count = q.count()
-    issues = (
-        q.order_by(Issue.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
+    else:
+        page = page.order_by(Issue.created_at.desc(), Issue.id.desc())
+    if cursor:
+        cursor_at, cursor_id = decode_cursor(cursor)
+        if not isinstance(cursor_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page = page.filter(tuple_(Issue.created_at, Issue.id) < tuple_(cursor_at, cursor_id))
+        offset = 0
+    elif offset:
+        page = page.offset(offset)
+
+    # Issues, creator, assignee and photos in a single statement
+    rows = db.execute(page.limit(limit)).all()
+
+    next_cursor = (
+        encode_cursor(rows[-1].created_at, rows[-1].id)
+        if len(rows) == limit and not by_relevance
+        else None
     )
 
-    if not issues:
-        return {
-            "items": [],
+    body = dump_json(
+        {
+            "items": issue_rows_to_items(rows, auth),
             "total": total_count,
             "offset": offset,
             "limit": limit,
+            "next_cursor": next_cursor,
+            "total_exact": total_exact,
         }
+    )
+    response_cache.store(cache_key, body, etag)
+    response = Response(content=body, media_type="application/json")
+    if etag:
+        set_etag(response, etag)
+    return response
 
-    # --------- BATCH FETCH RELATED DATA ---------
-    issue_ids = [i.id for i in issues]
 
-    # Photos
-    attachments = (
-        db.query(IssueAttachment)
-        .filter(IssueAttachment.issue_id.in_(issue_ids))
-        .all()
+@router.get("/clusters", response_model=IssueClustersOut)
+@limiter.limit("60/minute")
+def issue_clusters(
+    request: Request,
+    db: Session = Depends(get_db),
+    bbox: str = Query(..., description="minLng,minLat,maxLng,maxLat"),
+    zoom: int = Query(..., ge=0, le=22),
+    status: Optional[IssueStatus] = Query(default=None),
+    statuses: Optional[str] = Query(
+        default=None, description="Comma-separated list of statuses"
+    ),
+    category: Optional[str] = Query(default=None),
+    state_code: Optional[str] = Query(default=None),
+    date_range: Optional[str] = Query(default=None),
+):
+    """Map markers pre-aggregated by snapping issues to a zoom-dependent grid."""
+    from sqlalchemy import func as sa_func
+
+    filters = _normalize_issue_filters(
+        status=status,
+        statuses=statuses,
+        category=category,
+        state_code=state_code,
+        bbox=bbox,
+        date_range=date_range,
     )
-    photos_by_issue: dict[int, list[str]] = {}
-    for a in attachments:
-        photos_by_issue.setdefault(a.issue_id, []).append(a.url)
-
-    # Creators
-    creator_ids = {i.created_by_id for i in issues if i.created_by_id}
-    creators: dict[int, User] = {}
-    if creator_ids:
-        for u in db.query(User).filter(User.id.in_(creator_ids)):
-            creators[u.id] = u
-
-    # Assigned users
-    assigned_ids = {
-        i.assigned_to_id for i in issues if i.assigned_to_id
-    }
-    assignees: dict[int, User] = {}
-    if assigned_ids:
-        for u in db.query(User).filter(User.id.in_(assigned_ids)):
-            assignees[u.id] = u
+    cache_key, cached = response_cache.lookup("clusters", {"filters": filters, "zoom": zoom})
+    if cached:
+        return Response(content=cached[0], media_type="application/json")
 
-    result: list[IssueOut] = []
-    for issue in issues:
-        creator_user = (
-            creators.get(issue.created_by_id) if issue.created_by_id else None
+    size = cluster_size_deg(zoom)
+
+    if zoom >= POINTS_MIN_ZOOM:
+        rows = (
+            _apply_issue_filters(
+                db.query(
+                    Issue.id, Issue.lat, Issue.lng, Issue.status, Issue.category, Issue.title
+                ),
+                filters,
+            )
+            .order_by(Issue.created_at.desc())
+            .limit(MAX_MAP_POINTS)
+            .all()
         )
-        assigned_user = (
-            assignees.get(issue.assigned_to_id)
-            if issue.assigned_to_id
-            else None
+        result = {
+            "zoom": zoom,
+            "cell_size": size,
+            "points": [
+                {
+                    "id": r.id,
+                    "lat": r.lat,
+                    "lng": r.lng,
+                    "status": r.status.value,
+                    "category": r.category,
+                    "title": r.title,
+                }
+                for r in rows
+            ],
+        }
+    else:
+        gx = sa_func.floor(Issue.lng / size)
+        gy = sa_func.floor(Issue.lat / size)
+        rows = (
+            _apply_issue_filters(
+                db.query(
+                    sa_func.avg(Issue.lat).label("lat"),
+                    sa_func.avg(Issue.lng).label("lng"),
+                    sa_func.count(Issue.id).label("count"),
+                    sa_func.count(Issue.id)
+                    .filter(Issue.status == IssueStatus.pending)
+                    .label("pending"),
+                    sa_func.count(Issue.id)
+                    .filter(Issue.status == IssueStatus.in_progress)
+                    .label("in_progress"),
+                    sa_func.count(Issue.id)
+                    .filter(Issue.status == IssueStatus.resolved)
+                    .label("resolved"),
+                ),
+                filters,
+            )
+            .group_by(gx, gy)
+            .all()
         )
+        result = {
+            "zoom": zoom,
+            "cell_size": size,
+            "clusters": [
+                {
+                    "lat": float(r.lat),
+                    "lng": float(r.lng),
+                    "count": r.count,
+                    "pending": r.pending,
+                    "in_progress": r.in_progress,
+                    "resolved": r.resolved,
+                }
+                for r in rows
+            ],
+        }
 
-        # Filter email based on user role
-        show_creator_email = False
-        show_assigned_email = False
-        if auth:
-            if auth.role.value in ["super_admin", "admin", "staff"]:
-                show_creator_email = True
-                show_assigned_email = True
-            elif creator_user and creator_user.id == auth.id:
-                show_creator_email = True
-            elif assigned_user and assigned_user.id == auth.id:
-                show_assigned_email = True
-
-        creator_data = (
-            {
-                "id": creator_user.id,
-                "name": creator_user.name,
-                "email": creator_user.email if show_creator_email else None,
-                "role": (
-                    creator_user.role.value
-                    if hasattr(creator_user.role, "value")
-                    else str(creator_user.role)
-                )
-                if creator_user and creator_user.role
-                else None,
-            }
-            if creator_user
-            else None
-        )
+    body = dump_json(IssueClustersOut.model_validate(result).model_dump(mode="json"))
+    response_cache.store(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
-        assigned_data = (
-            {
-                "id": assigned_user.id,
-                "name": assigned_user.name,
-                "email": assigned_user.email
-                if show_assigned_email
-                else None,
-                "role": (
-                    assigned_user.role.value
-                    if hasattr(assigned_user.role, "value")
-                    else str(assigned_user.role)
-                )
-                if assigned_user and assigned_user.role
-                else None,
-            }
-            if assigned_user
-            else None
+
+def _export_rows(filters: dict, fmt: str):
+    """Yield the filtered issues as CSV or NDJSON chunks, one server-side batch at a time."""
+    import csv
+    import io
+    from sqlalchemy import func as sa_func, select
+    from sqlalchemy.orm import aliased
+
+    creator = aliased(User)
+    assignee = aliased(User)
+    photo_count = (
+        select(sa_func.count(IssueAttachment.id))
+        .where(IssueAttachment.issue_id == Issue.id)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            Issue.id,
+            Issue.title,
+            Issue.description,
+            Issue.category,
+            Issue.status,
+            Issue.lat,
+            Issue.lng,
+            Issue.address,
+            Issue.country,
+            Issue.state_code,
+            Issue.created_at,
+            Issue.updated_at,
+            Issue.in_progress_at,
+            Issue.resolved_at,
+            Issue.created_by_id,
+            creator.name.label("creator_name"),
+            creator.email.label("creator_email"),
+            Issue.assigned_to_id,
+            assignee.name.label("assignee_name"),
+            assignee.email.label("assignee_email"),
+            photo_count.label("photo_count"),
         )
+        .outerjoin(creator, creator.id == Issue.created_by_id)
+        .outerjoin(assignee, assignee.id == Issue.assigned_to_id)
+    )
+    stmt = (
+        _apply_issue_filters(stmt, filters)
+        .order_by(Issue.created_at.desc(), Issue.id.desc())
+        .execution_options(yield_per=EXPORT_BATCH)
+    )
 
-        issue_dict = {
-            "id": issue.id,
-            "title": issue.title,
-            "description": issue.description,
-            "category": issue.category,
-            "status": issue.status.value,
-            "lat": issue.lat,
-            "lng": issue.lng,
-            "address": issue.address,
-            "country": issue.country,
-            "state_code": issue.state_code,
-            "created_at": issue.created_at,
-            "updated_at": issue.updated_at,
-            "in_progress_at": issue.in_progress_at,
-            "resolved_at": issue.resolved_at,
-            "assigned_to_id": issue.assigned_to_id,
-            "creator": creator_data,
-            "assigned_to": assigned_data,
-        }
+    db = SessionLocal()
+    try:
+        if fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(EXPORT_FIELDS)
+            yield buf.getvalue()
+
+        for batch in db.execute(stmt).partitions():
+            buf = io.StringIO()
+            writer = csv.writer(buf) if fmt == "csv" else None
+            for row in batch:
+                record = {}
+                for key, value in row._mapping.items():
+                    if isinstance(value, IssueStatus):
+                        value = value.value
+                    elif isinstance(value, datetime):
+                        value = value.isoformat()
+                    record[key] = value
+                if writer:
+                    writer.writerow([record[k] for k in EXPORT_FIELDS])
+                else:
+                    buf.write(json.dumps(record, ensure_ascii=False))
+                    buf.write("\n")
+            yield buf.getvalue()
+    finally:
+        db.close()
 
-        out = IssueOut.model_validate(issue_dict)
-        out.photos = photos_by_issue.get(issue.id, [])
-        result.append(out)
 
-    return {
-        "items": result,
-        "total": total_count,
-        "offset": offset,
-        "limit": limit,
-    }
+@router.get("/export")
+def export_issues(
+    format: Literal["csv", "ndjson"] = Query(default="csv"),
+    status: Optional[IssueStatus] = Query(default=None),
+    statuses: Optional[str] = Query(
+        default=None, description="Comma-separated list of statuses"
+    ),
+    category: Optional[str] = Query(default=None),
+    state_code: Optional[str] = Query(default=None),
+    bbox: Optional[str] = Query(
+        default=None, description="minLng,minLat,maxLng,maxLat"
+    ),
+    date_range: Optional[str] = Query(default=None),
+    search: Optional[str] = Query(default=None),
+    assigned_to_id: Optional[int] = Query(default=None),
+    overdue: int = Query(default=0, ge=0, le=1),
+    needs_attention: int = Query(default=0, ge=0, le=1),
+    _=Depends(require_role("admin", "super_admin")),
+):
+    """Stream every issue matching the list_issues filters, with constant memory."""
+    filters = _normalize_issue_filters(
+        status=status,
+        statuses=statuses,
+        category=category,
+        state_code=state_code,
+        bbox=bbox,
+        date_range=date_range,
+        search=search,
+        assigned_to_id=assigned_to_id,
+        overdue=overdue,
+        needs_attention=needs_attention,
+    )
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"issues-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        _export_rows(filters, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/cache/stats")
+def response_cache_stats(_=Depends(require_role("admin", "super_admin"))):
+    """Hit/miss counters for the issue list and map response cache."""
+    return response_cache.stats()
 
 
 @router.patch("/{issue_id}/status", response_model=IssueOut)
@@ -853,7 +895,6 @@ def update_status(
     body: dict,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
 ):
 
     new_status = body.get("status")
@@ -915,23 +956,16 @@ def update_status(
 
     # Add comment if provided
     if comment_body:
-        db.execute(
-            text(
-                "insert into issue_comments(issue_id,user_id,body,created_at) values (:i,:u,:b,:t)"
-            ),
-            {"i": issue_id, "u": current_user.id, "b": comment_body, "t": now},
-        )
+        db.add(IssueComment(issue_id=issue_id, user_id=current_user.id, body=comment_body, created_at=now))
 
+    notifications.enqueue(
+        db, "issue_status", issue_id=issue_id, new_status=new_status, changer_id=current_user.id
+    )
+    bump_issue_version(db, obj.id)
     db.commit()
+    response_cache.invalidate()
     db.refresh(obj)
 
-    background_tasks.add_task(
-        _send_status_change_notifications_safe,
-        issue_id=issue_id,
-        new_status=new_status,
-        changer_id=current_user.id,
-    )
-
     photos = _get_issue_photos(db, obj.id)
     issue_dict = {
         "id": obj.id,
@@ -952,9 +986,19 @@ def update_status(
 @router.get("/{issue_id}")
 def get_issue(
     issue_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current=Depends(get_optional_user),
 ):
+    version = issue_version(db, issue_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    etag = issue_etag("issue", issue_id, version, current)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     issue = db.query(Issue).filter(Issue.id == issue_id).first()
     if not issue:
         raise HTTPException(status_code=404, detail="Not found")
@@ -1029,7 +1073,6 @@ def update_issue(
     body: IssueUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
 ):
     from datetime import datetime
 
@@ -1101,20 +1144,22 @@ def update_issue(
         else:
             obj.assigned_to_id = assigned_id
             obj.updated_at = datetime.utcnow()
+            notifications.enqueue(
+                db,
+                "issue_assigned",
+                issue_id=obj.id,
+                assigned_id=assigned_id,
+                assigner_id=current_user.id,
+                old_assigned_id=old_assigned_id,
+            )
+            bump_issue_version(db, obj.id)
             try:
                 db.commit()
                 db.refresh(obj)
             except Exception:
                 db.rollback()
                 raise HTTPException(status_code=500, detail="Failed to update issue")
-
-            background_tasks.add_task(
-                _send_assignment_notifications_safe,
-                issue_id=obj.id,
-                assigned_id=obj.assigned_to_id,
-                assigner_id=current_user.id,
-                old_assigned_id=old_assigned_id,
-            )
+            response_cache.invalidate()
 
     # ---- RESPONSE ----
     photos = _get_issue_photos(db, obj.id)
@@ -1178,47 +1223,74 @@ def update_issue(
     return out_dict
 
 
+def _role_str(role) -> Optional[str]:
+    if role is None:
+        return None
+    return role.value if hasattr(role, "value") else str(role)
+
+
+def _comment_out(comment_id, body, created_at, user_id, author, user_role, creator_id) -> dict:
+    return {
+        "id": comment_id,
+        "body": body,
+        "created_at": created_at.isoformat() if created_at else None,
+        "author": author,
+        "user_role": _role_str(user_role),
+        "is_creator": user_id == creator_id if creator_id and user_id else False,
+    }
+
+
 @router.get("/{issue_id}/comments")
-def list_comments(issue_id: int, db: Session = Depends(get_db)):
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
-    creator_id = issue.created_by_id if issue else None
+def list_comments(
+    issue_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = Query(
+        default=None, description="Opaque X-Next-Cursor from a previous page"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Newest first; when older comments remain, X-Next-Cursor points at the next page."""
+    version = issue_version(db, issue_id)
+    if version is not None:
+        etag = issue_etag("comments", issue_id, version, None)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+
+    creator_id = db.execute(
+        select(Issue.created_by_id).where(Issue.id == issue_id)
+    ).scalar()
+    q = (
+        select(
+            IssueComment.id,
+            IssueComment.body,
+            IssueComment.created_at,
+            IssueComment.user_id,
+            func.coalesce(User.name, User.email, "Anonymous").label("author"),
+            User.role.label("user_role"),
+        )
+        .outerjoin(User, User.id == IssueComment.user_id)
+        .where(IssueComment.issue_id == issue_id)
+    )
+    if cursor:
+        cursor_at, cursor_id = decode_cursor(cursor)
+        if not isinstance(cursor_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        q = q.where(tuple_(IssueComment.created_at, IssueComment.id) < tuple_(cursor_at, cursor_id))
     rows = db.execute(
-        text(
-            """
-      select c.id, c.body, c.created_at, c.user_id, 
-             coalesce(u.name, u.email, 'Anonymous') as author,
-             u.role as user_role
-      from issue_comments c left join users u on u.id=c.user_id
-      where c.issue_id=:iid order by c.created_at desc
-    """
-        ),
-        {"iid": issue_id},
-    ).mappings().all()
-    result = []
-    for r in rows:
-        user_role = r["user_role"]
-        if user_role and hasattr(user_role, "value"):
-            user_role_str = user_role.value
-        elif user_role:
-            user_role_str = str(user_role)
-        else:
-            user_role_str = None
-        comment = {
-            "id": r["id"],
-            "body": r["body"],
-            "created_at": r["created_at"].isoformat()
-            if r["created_at"]
-            else None,
-            "author": r["author"],
-            "user_role": user_role_str,
-            "is_creator": (
-                r["user_id"] == creator_id
-                if creator_id and r["user_id"]
-                else False
-            ),
-        }
-        result.append(comment)
-    return result
+        q.order_by(IssueComment.created_at.desc(), IssueComment.id.desc()).limit(limit + 1)
+    ).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return [
+        _comment_out(r.id, r.body, r.created_at, r.user_id, r.author, r.user_role, creator_id)
+        for r in rows
+    ]
 
 
 @router.post("/{issue_id}/comments")
@@ -1227,7 +1299,6 @@ def add_comment(
     payload: dict,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
 ):
     if not user:
         raise HTTPException(
@@ -1247,62 +1318,156 @@ def add_comment(
     body = (payload.get("body") or "").strip()
     if len(body) < 1:
         raise HTTPException(status_code=400, detail="Empty comment")
-    from datetime import datetime, timezone as dt_tz
-
-    now = datetime.now(dt_tz.utc)
-    db.execute(
-        text(
-            "insert into issue_comments(issue_id,user_id,body,created_at) values (:i,:u,:b,:t)"
-        ),
-        {"i": issue_id, "u": user.id, "b": body, "t": now},
+
+    comment_id, created_at = db.execute(
+        insert(IssueComment)
+        .values(issue_id=issue_id, user_id=user.id, body=body, created_at=datetime.now(timezone.utc))
+        .returning(IssueComment.id, IssueComment.created_at)
+    ).one()
+    creator_id = issue.created_by_id
+    notifications.enqueue(
+        db, "issue_comment", issue_id=issue_id, comment_author_id=user.id, comment_body=body
     )
+    bump_issue_version(db, issue_id)
     db.commit()
+    response_cache.invalidate()
 
-    background_tasks.add_task(
-        _send_comment_notifications_safe,
-        issue_id=issue_id,
-        comment_author_id=user.id,
-        comment_body=body,
+    return _comment_out(
+        comment_id, body, created_at, user.id, user.name or user.email or "Anonymous", user.role, creator_id
     )
 
-    # Fetch the created comment
-    creator_id = issue.created_by_id
-    row = db.execute(
-        text(
-            """
-      select c.id, c.body, c.created_at, c.user_id,
-             coalesce(u.name, u.email, 'Anonymous') as author,
-             u.role as user_role
-      from issue_comments c left join users u on u.id=c.user_id
-      where c.issue_id=:iid and c.user_id=:uid and c.body=:b
-      order by c.created_at desc limit 1
+
+def _get_attachable_issue(db: Session, issue_id: int, user: User) -> Issue:
+    """Photos can be added by the reporter or by staff."""
+    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    if not issue:
+        raise HTTPException(status_code=404, detail="Issue not found")
+    is_staff = user.role in (UserRole.staff, UserRole.admin, UserRole.super_admin)
+    if not is_staff and issue.created_by_id != user.id:
+        raise HTTPException(status_code=403, detail="Not allowed to add photos to this issue")
+    return issue
+
+
+@router.post("/{issue_id}/uploads", response_model=UploadTargetsOut)
+@limiter.limit("20/minute")
+def create_upload_targets(
+    request: Request,
+    issue_id: int,
+    payload: UploadTargetsIn,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
     """
-        ),
-        {"iid": issue_id, "uid": user.id, "b": body},
-    ).mappings().first()
-    if row:
-        user_role = row["user_role"]
-        if user_role and hasattr(user_role, "value"):
-            user_role_str = user_role.value
-        elif user_role:
-            user_role_str = str(user_role)
-        else:
-            user_role_str = None
-        return {
-            "id": row["id"],
-            "body": row["body"],
-            "created_at": row["created_at"].isoformat()
-            if row["created_at"]
-            else None,
-            "author": row["author"],
-            "user_role": user_role_str,
-            "is_creator": (
-                row["user_id"] == creator_id
-                if creator_id and row["user_id"]
-                else False
-            ),
-        }
-    return {"ok": True}
+    Phase 1 of a direct upload: signed URLs the client PUTs each photo to.
+
+    The photo bytes never pass through the API; call /uploads/finalize once
+    the PUTs have succeeded to attach them to the issue.
+    """
+    if not storage.supports_direct_upload():
+        raise HTTPException(status_code=409, detail="Direct uploads require object storage")
+    _get_attachable_issue(db, issue_id, user)
+
+    existing = db.query(IssueAttachment).filter_by(issue_id=issue_id).count()
+    if existing + len(payload.files) > MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"Max {MAX_FILES} images")
+    for f in payload.files:
+        if f.content_type not in ALLOWED:
+            raise HTTPException(status_code=400, detail="Unsupported image type")
+        if f.size > MAX_BYTES:
+            raise HTTPException(status_code=400, detail="Image exceeds 2MB")
+
+    targets = []
+    try:
+        for f in payload.files:
+            key = make_object_key(issue_id, f.content_type)
+            targets.append(
+                {
+                    "key": key,
+                    "upload_url": storage.create_upload_target(key),
+                    "content_type": f.content_type,
+                }
+            )
+    except Exception as e:
+        logging.error(f"Failed to sign uploads for issue #{issue_id}: {e}")
+        raise HTTPException(status_code=502, detail="Storage unavailable, please try again")
+    return {"targets": targets}
+
+
+@router.post("/{issue_id}/uploads/finalize")
+@limiter.limit("20/minute")
+def finalize_uploads(
+    request: Request,
+    issue_id: int,
+    payload: UploadFinalizeIn,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks = BackgroundTasks(),
+):
+    """
+    Phase 2 of a direct upload: verify the stored objects and record them.
+
+    Objects that are too large, not an allowed image type, or whose magic
+    bytes do not match their declared type are deleted from storage and the whole request is rejected. Re-finalizing a key that is
+    already attached is a no-op.
+    """
+    if not storage.supports_direct_upload():
+        raise HTTPException(status_code=409, detail="Direct uploads require object storage")
+    _get_attachable_issue(db, issue_id, user)
+
+    keys = list(dict.fromkeys(payload.keys))
+    for key in keys:
+        if not OBJECT_KEY_RE.match(key) or not key.startswith(f"{issue_id}/"):
+            raise HTTPException(status_code=400, detail=f"Invalid upload key: {key}")
+
+    attached = {a.url for a in db.query(IssueAttachment).filter_by(issue_id=issue_id).all()}
+    pending = [k for k in keys if storage.public_url(k) not in attached]
+    if len(attached) + len(pending) > MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"Max {MAX_FILES} images")
+
+    found, rejected = [], []
+    try:
+        for key in pending:
+            info = storage.stat_object(key)
+            if info is None:
+                raise HTTPException(status_code=400, detail=f"Upload not found: {key}")
+            size, content_type = info
+            # the declared type is the client's claim; check the bytes as _check_upload does
+            if (
+                content_type not in ALLOWED
+                or size > MAX_BYTES
+                or sniff_image_type(storage.read_object_head(key)) != content_type
+            ):
+                rejected.append(key)
+            else:
+                found.append((key, size, content_type))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Failed to verify uploads for issue #{issue_id}: {e}")
+        raise HTTPException(status_code=502, detail="Storage unavailable, please try again")
+    if rejected:
+        storage.delete_objects(rejected)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Rejected {len(rejected)} upload(s): unsupported image type or larger than 2MB",
+        )
+
+    attachments = [
+        IssueAttachment(
+            issue_id=issue_id,
+            url=storage.public_url(key),
+            content_type=content_type,
+            size=size,
+        )
+        for key, size, content_type in found
+    ]
+    if attachments:
+        db.add_all(attachments)
+        bump_issue_version(db, issue_id)
+        db.commit()
+        response_cache.invalidate()
+        background_tasks.add_task(generate_variants_safe, [a.id for a in attachments])
+    return {"photos": _get_issue_photos(db, issue_id)}
 
 
 @router.get("/{issue_id}/related")
@@ -1314,149 +1479,117 @@ def get_related_issues(issue_id: int, db: Session = Depends(get_db)):
     if not issue.lat or not issue.lng:
         return []
 
-    from math import radians, cos, sin, asin, sqrt
-
-    def haversine(lat1, lon1, lat2, lon2):
-        R = 6371000
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-        c = 2 * asin(sqrt(a))
-        return R * c
-
-    all_issues = (
-        db.query(Issue).filter(Issue.id != issue_id).all()
-    )
-    nearby = []
-    for other in all_issues:
-        if other.lat and other.lng:
-            distance = haversine(
-                issue.lat, issue.lng, other.lat, other.lng
-            )
-            if distance <= 50:
-                nearby.append(
-                    {
-                        "id": other.id,
-                        "title": other.title,
-                        "status": other.status.value,
-                        "category": other.category,
-                        "distance_m": round(distance),
-                    }
-                )
-
-    nearby.sort(key=lambda x: x["distance_m"])
-    return nearby[:10]
+    others = db.query(Issue).filter(Issue.id != issue_id)
+    return [
+        {
+            "id": other.id,
+            "title": other.title,
+            "status": other.status.value,
+            "category": other.category,
+            "distance_m": round(distance),
+        }
+        for other, distance in nearest(others, Issue, issue.lat, issue.lng, k=10, max_distance_m=50)
+    ]
 
 
 @router.get("/{issue_id}/activity")
 def get_issue_activity(
-    issue_id: int, db: Session = Depends(get_db)
+    issue_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        default=None, description="Opaque X-Next-Cursor from a previous page"
+    ),
+    since: Optional[datetime] = Query(
+        default=None, description="Only entries strictly after this time (for polling)"
+    ),
+    db: Session = Depends(get_db),
 ):
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
-    if not issue:
+    """
+    Chronological timeline (created, assignment, status changes, comments),
+    oldest first. When more entries follow, the X-Next-Cursor header carries
+    the cursor for the next page.
+    """
+    version = issue_version(db, issue_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Issue not found")
+    etag = issue_etag("activity", issue_id, version, None)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    t = timeline_select(issue_id)
+    q = select(t.c.kind, t.c.at, t.c.user, t.c.comment, t.c.rank, t.c.row_id)
+    if since is not None:
+        q = q.where(t.c.at > since)
+    if cursor:
+        cursor_at, key = decode_cursor(cursor)
+        if not (isinstance(key, list) and len(key) == 2 and all(isinstance(k, int) for k in key)):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        q = q.where(timeline_key(t) > tuple_(cursor_at, *key))
+    rows = db.execute(q.order_by(t.c.at, t.c.rank, t.c.row_id).limit(limit + 1)).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.at, [last.rank, last.row_id])
+
+    return [
+        {
+            "kind": r.kind.value if hasattr(r.kind, "value") else r.kind,
+            "at": r.at.isoformat() if r.at else None,
+            "user": r.user,
+            "comment": r.comment,
+        }
+        for r in rows
+    ]
 
-    activities = []
 
-    if issue.created_at:
-        creator = None
-        if issue.created_by_id:
-            creator_user = (
-                db.query(User)
-                .filter(User.id == issue.created_by_id)
-                .first()
-            )
-            creator = (
-                creator_user.name
-                if creator_user and creator_user.name
-                else (
-                    creator_user.email
-                    if creator_user
-                    else "Anonymous"
-                )
-            )
-        activities.append(
-            {
-                "kind": "created",
-                "at": issue.created_at.isoformat(),
-                "user": creator,
-                "comment": None,
-            }
-        )
+def _id_array(ids: list[int]):
+    """Bind a list of ids as one Postgres array parameter (for `= ANY(...)`)."""
+    return bindparam("ids", ids, type_=ARRAY(Integer), unique=True)
 
-    if issue.assigned_to_id:
-        assigned_user = (
-            db.query(User)
-            .filter(User.id == issue.assigned_to_id)
-            .first()
-        )
-        assigned_name = (
-            assigned_user.name
-            if assigned_user and assigned_user.name
-            else (
-                assigned_user.email if assigned_user else "Unknown"
-            )
-        )
-        activities.append(
-            {
-                "kind": "assigned",
-                "at": issue.updated_at.isoformat()
-                if issue.updated_at
-                else issue.created_at.isoformat(),
-                "user": assigned_name,
-                "comment": None,
-            }
-        )
 
-    activity_records = (
-        db.query(IssueActivity)
-        .filter(IssueActivity.issue_id == issue_id)
-        .order_by(IssueActivity.at)
-        .all()
+def _bulk_update(db: Session, ids: list[int], values: dict, where=None):
+    """
+    UPDATE the given issues in one statement (bumping version) and return
+    (id, old assignee, old status, new assignee, new status) per updated row.
+    """
+    old = (
+        select(Issue.id, Issue.assigned_to_id, Issue.status)
+        .where(Issue.id == any_(_id_array(ids)))
+        .with_for_update()
+        .subquery("old")
     )
-    for act in activity_records:
-        act_kind = (
-            act.kind.value if hasattr(act.kind, "value") else str(act.kind)
-        )
-        # Skip "created" from IssueActivity since we already added it from issue.created_at
-        if act_kind == "created":
-            continue
-        activities.append(
-            {
-                "kind": act_kind,
-                "at": act.at.isoformat() if act.at else None,
-                "user": None,
-                "comment": None,
-            }
-        )
+    stmt = (
+        update(Issue)
+        .where(Issue.id == old.c.id)
+        .values(**values, version=Issue.version + 1)
+        .returning(Issue.id, old.c.assigned_to_id, old.c.status, Issue.assigned_to_id, Issue.status)
+    )
+    if where is not None:
+        stmt = stmt.where(where)
+    return db.execute(stmt).all()
 
-    comments = db.execute(
-        text(
-            """
-      select c.id, c.body, c.created_at, c.user_id, 
-             coalesce(u.name, u.email, 'Anonymous') as author
-      from issue_comments c left join users u on u.id=c.user_id
-      where c.issue_id=:iid order by c.created_at
-    """
-        ),
-        {"iid": issue_id},
-    ).mappings().all()
 
-    for comment in comments:
-        activities.append(
-            {
-                "kind": "comment",
-                "at": comment["created_at"].isoformat()
-                if comment["created_at"]
-                else None,
-                "user": comment["author"],
-                "comment": comment["body"],
-            }
-        )
+def _workload_deltas(rows) -> dict[int, int]:
+    """Open-count changes implied by (id, old assignee, old status, new assignee, new status) rows."""
+    deltas: dict[int, int] = {}
+    for _, old_user, old_status, new_user, new_status in rows:
+        if old_user is not None and old_status in OPEN_STATUSES:
+            deltas[old_user] = deltas.get(old_user, 0) - 1
+        if new_user is not None and new_status in OPEN_STATUSES:
+            deltas[new_user] = deltas.get(new_user, 0) + 1
+    return deltas
 
-    activities.sort(key=lambda x: x["at"] if x["at"] else "")
-    return activities
+
+def _bulk_activity(db: Session, issue_ids, kind: ActivityKind):
+    if issue_ids:
+        db.execute(
+            insert(IssueActivity),
+            [{"issue_id": i, "kind": kind} for i in issue_ids],
+        )
 
 
 @router.post("/bulk")
@@ -1465,6 +1598,13 @@ def bulk_operations(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    """
+    Assign / auto_assign / status / delete many issues with set-based statements.
+
+    IDs are processed BULK_CHUNK at a time in a single transaction. The
+    response lists an outcome per requested ID: "updated", "deleted",
+    "unchanged" (nothing to do) or "not_found".
+    """
     if current_user.role not in [UserRole.admin, UserRole.super_admin]:
         raise HTTPException(
             status_code=403, detail="Only admins can perform bulk operations"
@@ -1478,75 +1618,112 @@ def bulk_operations(
             status_code=400,
             detail="issue_ids must be a non-empty list",
         )
+    try:
+        issue_ids = list(dict.fromkeys(int(i) for i in issue_ids))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="issue_ids must be integers")
 
-    issues = db.query(Issue).filter(Issue.id.in_(issue_ids)).all()
-    if len(issues) != len(issue_ids):
-        raise HTTPException(
-            status_code=400, detail="Some issue IDs not found"
-        )
-
-    updated_count = 0
-
+    now = datetime.now(timezone.utc)
     if operation == "assign":
-        user_id = body.get("user_id")
+        # an explicit null / 0 unassigns; a missing key must not wipe assignments
+        if "user_id" not in body:
+            raise HTTPException(status_code=400, detail="user_id is required")
+        user_id = body["user_id"] or None
         if user_id is not None:
-            if user_id:
-                user = (
-                    db.query(User).filter(User.id == user_id).first()
+            user = db.query(User).filter(User.id == user_id).first()
+            if not user:
+                raise HTTPException(
+                    status_code=400, detail="User not found"
                 )
-                if not user:
-                    raise HTTPException(
-                        status_code=400, detail="User not found"
-                    )
-            for issue in issues:
-                issue.assigned_to_id = user_id
-                issue.updated_at = datetime.now(timezone.utc)
-                if user_id:
-                    try:
-                        db.add(
-                            IssueActivity(
-                                issue_id=issue.id,
-                                kind=ActivityKind.assigned,
-                            )
-                        )
-                    except Exception:
-                        pass
-            updated_count = len(issues)
-
+    elif operation == "auto_assign":
+        # Redistribute with the configured strategy; `strategy` may override it
+        strategy = body.get("strategy") or strategy_from_settings(_get_app_settings(db))
+        if strategy not in ASSIGNMENT_STRATEGIES:
+            raise HTTPException(status_code=400, detail="Invalid strategy")
     elif operation == "status":
         new_status = body.get("status")
         if new_status not in ["pending", "in_progress", "resolved"]:
             raise HTTPException(
                 status_code=400, detail="Invalid status"
             )
-        for issue in issues:
-            issue.status = IssueStatus(new_status)
-            issue.updated_at = datetime.now(timezone.utc)
-            if new_status == "in_progress":
-                issue.in_progress_at = datetime.now(timezone.utc)
-                db.add(
-                    IssueActivity(
-                        issue_id=issue.id,
-                        kind=ActivityKind.in_progress,
-                    )
-                )
-            elif new_status == "resolved":
-                issue.resolved_at = datetime.now(timezone.utc)
-                db.add(
-                    IssueActivity(
-                        issue_id=issue.id,
-                        kind=ActivityKind.resolved,
-                    )
-                )
-        updated_count = len(issues)
-
-    elif operation == "delete":
-        for issue in issues:
-            db.delete(issue)
-        updated_count = len(issues)
-
-    else:
+    elif operation != "delete":
         raise HTTPException(status_code=400, detail="Invalid operation")
 
+    outcomes: dict[int, str] = {}
+    deltas: dict[int, int] = {}
+    for start in range(0, len(issue_ids), BULK_CHUNK):
+        chunk = issue_ids[start:start + BULK_CHUNK]
+
+        if operation == "delete":
+            deleted = db.execute(
+                delete(Issue)
+                .where(Issue.id == any_(_id_array(chunk)))
+                .returning(Issue.id, Issue.assigned_to_id, Issue.status)
+            ).all()
+            rows = [(i, user, status, None, None) for i, user, status in deleted]
+            outcomes.update((r[0], "deleted") for r in rows)
+
+        elif operation == "assign":
+            rows = _bulk_update(
+                db,
+                chunk,
+                {"assigned_to_id": user_id, "updated_at": now},
+                Issue.assigned_to_id.is_distinct_from(user_id),
+            )
+            if user_id:
+                _bulk_activity(db, [r[0] for r in rows], ActivityKind.assigned)
+
+        elif operation == "auto_assign":
+            # resolved issues keep their owner (reported as unchanged below)
+            targets = db.execute(
+                select(Issue.id, Issue.state_code, Issue.lat, Issue.lng, Issue.assigned_to_id)
+                .where(Issue.id == any_(_id_array(chunk)), Issue.status.in_(OPEN_STATUSES))
+            ).all()
+            picks = assignment_engine.assign_many(db, targets, strategy)
+            picks = {
+                t.id: picks[t.id]
+                for t in targets
+                if picks.get(t.id) is not None and picks[t.id] != t.assigned_to_id
+            }
+            rows = []
+            if picks:
+                chosen = sa_values(
+                    column("issue_id", Integer), column("user_id", Integer), name="chosen"
+                ).data(list(picks.items()))
+                rows = _bulk_update(
+                    db,
+                    list(picks),
+                    {"assigned_to_id": chosen.c.user_id, "updated_at": now},
+                    Issue.id == chosen.c.issue_id,
+                )
+                _bulk_activity(db, [r[0] for r in rows], ActivityKind.assigned)
+
+        else:  # status
+            status = IssueStatus(new_status)
+            values = {"status": status, "updated_at": now}
+            if status == IssueStatus.in_progress:
+                values["in_progress_at"] = now
+            elif status == IssueStatus.resolved:
+                values["resolved_at"] = now
+            rows = _bulk_update(db, chunk, values, Issue.status != status)
+            if status != IssueStatus.pending:
+                _bulk_activity(db, [r[0] for r in rows], ActivityKind(new_status))
+
+        if operation != "delete":
+            for r in rows:
+                outcomes[r[0]] = "updated"
+        for user, delta in _workload_deltas(rows).items():
+            deltas[user] = deltas.get(user, 0) + delta
+
+    adjust_workload(db.connection(), deltas)
     db.commit()
-    return {"ok": True, "updated_count": updated_count}
\ No newline at end of file
+    response_cache.invalidate()
+
+    # IDs no statement touched either exist (nothing to change) or do not
+    rest = [i for i in issue_ids if i not in outcomes]
+    if rest:
+        existing = set(db.execute(select(Issue.id).where(Issue.id == any_(_id_array(rest)))).scalars())
+        outcomes.update((i, "unchanged" if i in existing else "not_found") for i in rest)
+    results = [{"id": i, "result": outcomes[i]} for i in issue_ids]
+    updated_count = sum(1 for r in results if r["result"] in ("updated", "deleted"))
+    return {"ok": True, "updated_count": updated_count, "results": results}
@@ -0,0 +1,40 @@
+# app/routers/media.py
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+import re
+
+from app.services import storage
+from app.services.storage import FilesystemBackend, sniff_image_type
+
+router = APIRouter(prefix="/media", tags=["media"])
+
+DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+@router.get("/{digest}")
+def get_media(digest: str):
+    """
+    Serve a content-addressed photo from the filesystem backend.
+
+    FileResponse streams from disk (sendfile where the server supports it)
+    and answers Range requests; the URL changes whenever the bytes do, so
+    responses are cacheable forever.
+    """
+    backend = storage.backend
+    if not isinstance(backend, FilesystemBackend) or not DIGEST_RE.match(digest):
+        raise HTTPException(status_code=404, detail="Not found")
+    path = backend.blob_path(digest)
+    try:
+        with open(path, "rb") as f:
+            head = f.read(16)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Not found")
+    return FileResponse(
+        path,
+        media_type=sniff_image_type(head) or "application/octet-stream",
+        headers={
+            "ETag": f'"{digest}"',
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "X-Content-Type-Options": "nosniff",
+        },
+    )
@@ -0,0 +1,30 @@
+# File: app/routers/notification_preferences.py
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.core.security import get_current_user
+from app.models.user import User, UserRole
+from app.models.notification_preference import NotificationPreference
+from app.schemas.user import NotificationPreferencesIn, NotificationPreferencesOut
+
+router = APIRouter(prefix="/notifications", tags=["notifications"])
+
+@router.get("/preferences", response_model=NotificationPreferencesOut)
+def get_preferences(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    pref = db.get(NotificationPreference, user.id)
+    return pref or NotificationPreferencesOut()
+
+@router.put("/preferences", response_model=NotificationPreferencesOut)
+def update_preferences(body: NotificationPreferencesIn, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    changes = body.model_dump(exclude_none=True)
+    if changes.get("watch_all_comments") and user.role not in (UserRole.admin, UserRole.super_admin):
+        raise HTTPException(400, "Only admins can watch comments on all issues")
+    pref = db.get(NotificationPreference, user.id)
+    if pref is None:
+        pref = NotificationPreference(user_id=user.id)
+        db.add(pref)
+    for key, value in changes.items():
+        setattr(pref, key, value)
+    db.commit()
+    db.refresh(pref)
+    return pref
@@ -5,6 +5,7 @@ from app.db.session import get_db
 from app.core.security import require_role
 from app.models.region import StaffRegion
 from app.models.user import User
+from app.services.assignment import region_index
 
 router = APIRouter(prefix="/admin/regions", tags=["admin-regions"])
 
@@ -18,9 +19,10 @@ def add_user_region(user_id:int, body:dict, db: Session = Depends(get_db), _=Dep
     code = (body.get("state_code") or "").upper()
     if not code: raise HTTPException(400, "state_code required")
     db.add(StaffRegion(user_id=user_id, state_code=code)); db.commit()
+    region_index.invalidate()
     return {"ok": True}
 
 @router.delete("/{region_id}")
 def remove_user_region(region_id:int, db: Session = Depends(get_db), _=Depends(require_role("admin","super_admin"))):
     db.query(StaffRegion).filter(StaffRegion.id==region_id).delete()
-    db.commit(); return {"ok": True}
\ No newline at end of file
+    db.commit(); region_index.invalidate(); return {"ok": True}
\ No newline at end of file
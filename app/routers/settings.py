@@ -82,6 +82,23 @@ def get_settings(db: Session = Depends(get_db)):
 @router.put("", dependencies=[Depends(require_role("super_admin"))])
 def update_settings(payload: dict, db: Session = Depends(get_db)):
     from datetime import datetime, timezone
+    from app.services.assignment import STRATEGIES
+
+    features = payload.get("features")
+    strategy = features.get("assignment_strategy") if isinstance(features, dict) else None
+    if strategy is not None and strategy not in STRATEGIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"assignment_strategy must be one of: {', '.join(STRATEGIES)}",
+        )
+    digest_minutes = features.get("email_digest_minutes") if isinstance(features, dict) else None
+    if digest_minutes is not None and not (
+        isinstance(digest_minutes, int) and not isinstance(digest_minutes, bool) and 1 <= digest_minutes <= 1440
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="email_digest_minutes must be a whole number of minutes between 1 and 1440",
+        )
     
     try:
         s = db.query(AppSettings).first()
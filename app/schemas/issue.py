@@ -63,6 +63,36 @@ class PaginatedIssuesOut(BaseModel):
     total: int
     offset: int
     limit: int
+    # keyset cursor for the page after this one; None on the last page
+    next_cursor: Optional[str] = None
+    # False when total is a planner estimate or capped (e.g. "10000+")
+    total_exact: bool = True
+
+
+class IssueCluster(BaseModel):
+    lat: float
+    lng: float
+    count: int
+    pending: int = 0
+    in_progress: int = 0
+    resolved: int = 0
+
+
+class IssuePoint(BaseModel):
+    id: int
+    lat: float
+    lng: float
+    status: Status
+    category: Optional[str] = None
+    title: str
+
+
+class IssueClustersOut(BaseModel):
+    zoom: int
+    cell_size: float
+    clusters: list[IssueCluster] = []
+    # only populated at high zoom (>= POINTS_MIN_ZOOM)
+    points: list[IssuePoint] = []
 
 
 class DuplicateIssueResponse(BaseModel):
@@ -71,4 +101,27 @@ class DuplicateIssueResponse(BaseModel):
     message: str
 
 class IssueUpdate(BaseModel):
-    assigned_to_id: Optional[int] = None
\ No newline at end of file
+    assigned_to_id: Optional[int] = None
+
+class UploadFileSpec(BaseModel):
+    filename: str = Field(min_length=1, max_length=200)
+    content_type: str
+    size: int = Field(gt=0)
+
+
+class UploadTargetsIn(BaseModel):
+    files: List[UploadFileSpec] = Field(min_length=1)
+
+
+class UploadTarget(BaseModel):
+    key: str
+    upload_url: str
+    content_type: str
+
+
+class UploadTargetsOut(BaseModel):
+    targets: List[UploadTarget]
+
+
+class UploadFinalizeIn(BaseModel):
+    keys: List[str] = Field(min_length=1)
@@ -14,4 +14,17 @@ class UserOut(BaseModel):
     role: str
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class NotificationPreferencesOut(BaseModel):
+    email_enabled: bool = True
+    push_enabled: bool = True
+    watch_all_comments: bool = False
+
+    class Config:
+        from_attributes = True
+
+class NotificationPreferencesIn(BaseModel):
+    email_enabled: bool | None = None
+    push_enabled: bool | None = None
+    watch_all_comments: bool | None = None
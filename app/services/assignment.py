@@ -0,0 +1,185 @@
+# app/services/assignment.py
+"""
+Auto-assignment of issues to staff.
+
+Candidates come from an in-memory RegionIndex: active staff per state_code,
+falling back to active admins and then super admins when a state has no
+staff. The index is rebuilt lazily after `region_index.invalidate()` (called
+by the regions / admin users routers on changes) and at least every
+REFRESH_SECONDS, so other workers pick up changes without coordination.
+
+A strategy then picks one candidate per issue:
+
+- least_loaded: fewest open issues (staff_workload), ties by user id
+- round_robin:  rotates through the candidates of each state
+- nearest:      closest centroid of the user's open issues, then least loaded
+
+The strategy is chosen per deployment with AppSettings.features
+["assignment_strategy"] (default least_loaded). `assign_many` resolves a whole
+batch with one workload query, counting its own picks so a batch is spread
+rather than piled on one person.
+"""
+import math
+import threading
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.issue import Issue, OPEN_STATUSES
+from app.models.region import StaffRegion
+from app.models.staff_workload import StaffWorkload
+from app.models.user import User, UserRole
+from app.services.geo import haversine
+
+REFRESH_SECONDS = 300
+DEFAULT_STRATEGY = "least_loaded"
+
+
+class RegionIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built_at: float | None = None
+        self.by_state: dict[str, tuple[int, ...]] = {}
+        self.admins: tuple[int, ...] = ()
+        self.super_admins: tuple[int, ...] = ()
+        self.centroids: dict[int, tuple[float, float]] = {}
+
+    def invalidate(self):
+        self._built_at = None
+
+    def _fresh(self) -> bool:
+        return self._built_at is not None and time.monotonic() - self._built_at < REFRESH_SECONDS
+
+    def ensure(self, db: Session):
+        if self._fresh():
+            return
+        with self._lock:
+            if not self._fresh():
+                self._rebuild(db)
+
+    def _rebuild(self, db: Session):
+        rows = db.execute(
+            select(User.id, User.role, StaffRegion.state_code)
+            .outerjoin(StaffRegion, StaffRegion.user_id == User.id)
+            .where(
+                User.is_active.is_(True),
+                User.role.in_((UserRole.staff, UserRole.admin, UserRole.super_admin)),
+            )
+            .order_by(User.id)
+        ).all()
+        by_state: dict[str, list[int]] = {}
+        admins, super_admins = [], []
+        for user_id, role, state_code in rows:
+            if role == UserRole.staff and state_code:
+                by_state.setdefault(state_code, []).append(user_id)
+            elif role == UserRole.admin and user_id not in admins:
+                admins.append(user_id)
+            elif role == UserRole.super_admin and user_id not in super_admins:
+                super_admins.append(user_id)
+
+        centroids = db.execute(
+            select(Issue.assigned_to_id, func.avg(Issue.lat), func.avg(Issue.lng))
+            .where(
+                Issue.assigned_to_id.is_not(None),
+                Issue.status.in_(OPEN_STATUSES),
+                Issue.lat.is_not(None),
+                Issue.lng.is_not(None),
+            )
+            .group_by(Issue.assigned_to_id)
+        ).all()
+
+        self.by_state = {k: tuple(v) for k, v in by_state.items()}
+        self.admins = tuple(admins)
+        self.super_admins = tuple(super_admins)
+        self.centroids = {u: (float(lat), float(lng)) for u, lat, lng in centroids}
+        self._built_at = time.monotonic()
+
+    def candidates(self, state_code: str | None) -> tuple[int, ...]:
+        """Regional staff, else admins, else super admins (call ensure() first)."""
+        return (state_code and self.by_state.get(state_code)) or self.admins or self.super_admins
+
+
+class LeastLoaded:
+    def pick(self, candidates, issue, loads, index: RegionIndex) -> int:
+        return min(candidates, key=lambda u: (loads.get(u, 0), u))
+
+
+class RoundRobin:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next: dict[tuple[int, ...], int] = {}
+
+    def pick(self, candidates, issue, loads, index: RegionIndex) -> int:
+        with self._lock:
+            i = self._next.get(candidates, 0)
+            self._next[candidates] = i + 1
+        return candidates[i % len(candidates)]
+
+
+class Nearest:
+    def pick(self, candidates, issue, loads, index: RegionIndex) -> int:
+        if issue.lat is None or issue.lng is None:
+            return LeastLoaded().pick(candidates, issue, loads, index)
+
+        def key(u):
+            c = index.centroids.get(u)
+            distance = haversine(issue.lat, issue.lng, c[0], c[1]) if c else math.inf
+            return (distance, loads.get(u, 0), u)
+
+        return min(candidates, key=key)
+
+
+STRATEGIES = {
+    "least_loaded": LeastLoaded(),
+    "round_robin": RoundRobin(),
+    "nearest": Nearest(),
+}
+
+
+def strategy_from_settings(app_settings) -> str:
+    features = getattr(app_settings, "features", None) or {}
+    name = features.get("assignment_strategy") or DEFAULT_STRATEGY
+    return name if name in STRATEGIES else DEFAULT_STRATEGY
+
+
+class AssignmentEngine:
+    def __init__(self, index: RegionIndex):
+        self.index = index
+
+    def assign(self, db: Session, issue, strategy: str = DEFAULT_STRATEGY) -> int | None:
+        """User id to assign `issue` to (anything with id/state_code/lat/lng), None if nobody."""
+        return self.assign_many(db, [issue], strategy).get(issue.id)
+
+    def assign_many(self, db: Session, issues, strategy: str = DEFAULT_STRATEGY) -> dict[int, int]:
+        """{issue id: user id} for every issue that has a candidate."""
+        self.index.ensure(db)
+        picker = STRATEGIES[strategy]
+        candidates = {i.id: self.index.candidates(i.state_code) for i in issues}
+        user_ids = {u for c in candidates.values() for u in c}
+        if not user_ids:
+            return {}
+        loads = dict(
+            db.execute(
+                select(StaffWorkload.user_id, StaffWorkload.open_count).where(
+                    StaffWorkload.user_id.in_(user_ids)
+                )
+            ).all()
+        )
+
+        result = {}
+        for issue in issues:
+            if not candidates[issue.id]:
+                continue
+            user_id = picker.pick(candidates[issue.id], issue, loads, self.index)
+            result[issue.id] = user_id
+            previous = getattr(issue, "assigned_to_id", None)
+            if previous != user_id:
+                loads[user_id] = loads.get(user_id, 0) + 1
+                if previous in loads:
+                    loads[previous] -= 1
+        return result
+
+
+region_index = RegionIndex()
+engine = AssignmentEngine(region_index)
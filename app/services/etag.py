@@ -0,0 +1,78 @@
+# app/services/etag.py
+"""
+ETags for polled issue endpoints.
+
+Each issue carries a `version` bumped on every change that affects what
+its detail, comments or activity endpoints return (status, assignment,
+comments, attachments). Detail ETags are strong and derived from that
+version; list ETags are weak and derived from the filter set plus an
+aggregate fingerprint of the matching rows.
+"""
+import hashlib
+import json
+
+from fastapi import Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.issue import Issue
+from app.services.issue_read import STAFF_ROLES
+
+
+def viewer_key(user) -> str:
+    """Who the response was rendered for: email visibility differs per viewer."""
+    if user is None:
+        return "anon"
+    role = user.role.value if hasattr(user.role, "value") else str(user.role)
+    if role in STAFF_ROLES:
+        return "staff"
+    return f"u{user.id}"
+
+
+def bump_issue_version(db: Session, *issue_ids: int):
+    """Increment the version of the given issues in the caller's transaction."""
+    if not issue_ids:
+        return
+    db.execute(
+        update(Issue)
+        .where(Issue.id.in_(issue_ids))
+        .values(version=Issue.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def issue_version(db: Session, issue_id: int) -> int | None:
+    """Current version of an issue (primary-key lookup), None if it does not exist."""
+    return db.execute(select(Issue.version).where(Issue.id == issue_id)).scalar()
+
+
+def issue_etag(resource: str, issue_id: int, version: int, user) -> str:
+    return f'"{resource}-{issue_id}-v{version}-{viewer_key(user)}"'
+
+
+def list_etag(key: dict, fingerprint) -> str:
+    raw = json.dumps([key, fingerprint], sort_keys=True, default=str)
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check using weak comparison (RFC 9110 13.1.2)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers["Vary"] = "Authorization"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
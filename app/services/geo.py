@@ -0,0 +1,130 @@
+# app/services/geo.py
+"""
+Fixed-grid spatial keys for issues.
+
+Every issue with coordinates gets a `geo_cell` (bigint) identifying the
+CELL_DEG x CELL_DEG grid square it falls in. Proximity lookups first narrow
+candidates to the surrounding cells through the btree index on `geo_cell`,
+then compute exact distances over the handful of rows left.
+"""
+from math import asin, cos, floor, radians, sin, sqrt
+
+from sqlalchemy import func, literal
+
+# ~111 m north-south, ~89-110 m east-west across India's latitude range.
+CELL_DEG = 0.001
+LNG_CELLS = int(round(360 / CELL_DEG))
+
+EARTH_RADIUS_M = 6371000
+METERS_PER_DEG_LAT = 111320
+
+# Map clustering: grid cells per 256px web-mercator tile (~64px clusters),
+# and the zoom from which individual points are returned instead.
+CLUSTER_CELLS_PER_TILE = 4
+POINTS_MIN_ZOOM = 16
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in meters."""
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    return EARTH_RADIUS_M * 2 * asin(sqrt(a))
+
+
+def _cell_xy(lat: float, lng: float) -> tuple[int, int]:
+    return int(floor((lat + 90) / CELL_DEG)), int(floor((lng + 180) / CELL_DEG))
+
+
+def cell_for(lat: float | None, lng: float | None) -> int | None:
+    """Grid cell id for a coordinate, or None when the issue has no location."""
+    if lat is None or lng is None:
+        return None
+    row, col = _cell_xy(lat, lng)
+    return row * LNG_CELLS + col
+
+
+def min_cell_size_m(lat: float) -> float:
+    """Shortest side of a grid cell at this latitude, in meters."""
+    return METERS_PER_DEG_LAT * CELL_DEG * max(cos(radians(lat)), 0.01)
+
+
+def rings_for_radius(lat: float, radius_m: float) -> int:
+    """Number of rings around the centre cell needed to cover `radius_m`."""
+    return max(1, int(-(-radius_m // min_cell_size_m(lat))))
+
+
+def neighbour_cells(lat: float, lng: float, rings: int = 1) -> list[int]:
+    """Cell ids of the (2*rings+1)^2 square centred on the coordinate's cell."""
+    row, col = _cell_xy(lat, lng)
+    cells = []
+    for r in range(row - rings, row + rings + 1):
+        for c in range(col - rings, col + rings + 1):
+            cells.append(r * LNG_CELLS + (c % LNG_CELLS))
+    return cells
+
+
+def find_within(q, model, lat: float, lng: float, radius_m: float) -> list[tuple[object, float]]:
+    """
+    Rows of `q` (an Issue query) within `radius_m` of the coordinate, nearest first.
+
+    Only rows in the neighbouring cells are loaded; exact distances are
+    computed in Python over that small candidate set.
+    """
+    cells = neighbour_cells(lat, lng, rings_for_radius(lat, radius_m))
+    candidates = q.filter(model.geo_cell.in_(cells)).all()
+    hits = []
+    for row in candidates:
+        if row.lat is None or row.lng is None:
+            continue
+        distance = haversine(lat, lng, row.lat, row.lng)
+        if distance <= radius_m:
+            hits.append((row, distance))
+    hits.sort(key=lambda h: h[1])
+    return hits
+
+
+def distance_sql(model, lat: float, lng: float):
+    """SQL expression for the haversine distance (meters) from `model`'s lat/lng."""
+    dlat = func.radians(model.lat - literal(lat)) * 0.5
+    dlng = func.radians(model.lng - literal(lng)) * 0.5
+    a = func.power(func.sin(dlat), 2) + (
+        cos(radians(lat)) * func.cos(func.radians(model.lat)) * func.power(func.sin(dlng), 2)
+    )
+    return 2 * EARTH_RADIUS_M * func.asin(func.sqrt(func.least(a, 1.0)))
+
+
+def nearest(
+    q, model, lat: float, lng: float, k: int, max_distance_m: float, max_rings: int = 8
+) -> list[tuple[object, float]]:
+    """
+    Up to `k` rows of `q` nearest to the coordinate and within `max_distance_m`.
+
+    Searches an expanding square of grid cells, ordering and limiting by
+    distance in SQL. Expansion stops once `k` hits are guaranteed to be the
+    true nearest (every unsearched cell is farther than the k-th hit), when
+    the square covers `max_distance_m`, or after `max_rings` rings.
+    """
+    cell_m = min_cell_size_m(lat)
+    last_ring = min(rings_for_radius(lat, max_distance_m), max_rings)
+    distance = distance_sql(model, lat, lng).label("distance_m")
+    hits: list[tuple[object, float]] = []
+    for rings in range(1, last_ring + 1):
+        rows = (
+            q.add_columns(distance)
+            .filter(model.geo_cell.in_(neighbour_cells(lat, lng, rings)))
+            .filter(distance <= max_distance_m)
+            .order_by(distance.asc(), model.id.asc())
+            .limit(k)
+            .all()
+        )
+        hits = [(row[0], float(row[1])) for row in rows]
+        if len(hits) >= k and hits[-1][1] <= rings * cell_m:
+            break
+    return hits
+
+
+def cluster_size_deg(zoom: int) -> float:
+    """Side of a clustering grid cell in degrees at a web-map zoom level."""
+    return 360 / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
@@ -0,0 +1,138 @@
+# app/services/images.py
+"""
+Derivative images for issue photos.
+
+After an attachment is stored, `generate_variants_safe` (run as a background
+task, off the request path) decodes it in a process pool and stores WebP
+renditions without EXIF metadata (orientation is applied first):
+
+- display:   longest side <= 1600 px, shown on the issue detail view
+- thumb_480: longest side <= 480 px, shown on list cards
+- thumb_160: longest side <= 160 px, for map popups / compact lists
+
+Variants are recorded in issue_attachment_variants; readers fall back to
+the original URL until they exist.
+"""
+import io
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps
+
+VARIANTS = {"display": 1600, "thumb_480": 480, "thumb_160": 160}
+LIST_VARIANT = "thumb_480"
+DETAIL_VARIANT = "display"
+WEBP_QUALITY = 80
+MAX_PIXELS = 40_000_000  # reject decompression bombs well before Pillow's own limit
+IMAGE_WORKERS = 2
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def render_variants(data: bytes) -> list[tuple[str, bytes, int, int]]:
+    """Decode one image and return (kind, webp bytes, width, height) per variant."""
+    with Image.open(io.BytesIO(data)) as img:
+        if img.width * img.height > MAX_PIXELS:
+            raise ValueError(f"Image too large: {img.width}x{img.height}")
+        # JPEG can decode at a reduced scale directly
+        img.draft("RGB", (VARIANTS["display"], VARIANTS["display"]))
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "A" in img.getbands() or img.mode == "P" else "RGB")
+
+        out = []
+        # largest first so each step downsamples the previous, smaller image
+        for kind, edge in sorted(VARIANTS.items(), key=lambda kv: -kv[1]):
+            img.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+            buf = io.BytesIO()
+            # a fresh save carries no EXIF/XMP/ICC unless passed explicitly
+            img.save(buf, "WEBP", quality=WEBP_QUALITY, method=4)
+            out.append((kind, buf.getvalue(), img.width, img.height))
+        return out
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: forking a threaded server process is not safe
+                _pool = ProcessPoolExecutor(
+                    max_workers=IMAGE_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def generate_variants_safe(attachment_ids: list[int]):
+    """Create and record variants for the given attachments (background task)."""
+    from sqlalchemy.dialects.postgresql import insert
+
+    from app.db.session import SessionLocal
+    from app.models.attachment import IssueAttachment, IssueAttachmentVariant
+    from app.services import response_cache, storage
+    from app.services.etag import bump_issue_version
+
+    if not attachment_ids:
+        return
+    db = SessionLocal()
+    try:
+        attachments = db.query(IssueAttachment).filter(IssueAttachment.id.in_(attachment_ids)).all()
+        pool = _get_pool()
+        jobs = []
+        for att in attachments:
+            try:
+                jobs.append((att, pool.submit(render_variants, storage.read_object(att.url))))
+            except Exception as e:
+                logging.error(f"Could not read attachment #{att.id} for variants: {e}")
+
+        rows, keys, issue_ids = [], [], set()
+        for att, job in jobs:
+            try:
+                rendered = job.result()
+                items = [
+                    (data, "image/webp", storage.make_object_key(att.issue_id, "image/webp"))
+                    for _, data, _, _ in rendered
+                ]
+                # all of an attachment's renditions or none: a failed upload
+                # deletes the ones already stored, like create_issue's originals
+                urls = storage.upload_many(items)
+            except Exception as e:
+                logging.error(f"Variant generation failed for attachment #{att.id}: {e}")
+                continue
+            for (kind, data, width, height), url in zip(rendered, urls):
+                rows.append(
+                    {
+                        "attachment_id": att.id,
+                        "kind": kind,
+                        "url": url,
+                        "content_type": "image/webp",
+                        "width": width,
+                        "height": height,
+                        "size": len(data),
+                    }
+                )
+            keys += [key for _, _, key in items]
+            issue_ids.add(att.issue_id)
+
+        if rows:
+            try:
+                db.execute(
+                    insert(IssueAttachmentVariant)
+                    .values(rows)
+                    .on_conflict_do_nothing(constraint="uq_attachment_variant_kind")
+                )
+                bump_issue_version(db, *issue_ids)
+                db.commit()
+            except Exception:
+                db.rollback()
+                storage.delete_objects(keys)  # nothing references them
+                raise
+            response_cache.invalidate()
+    except Exception as e:
+        logging.error(f"Error generating image variants: {e}", exc_info=True)
+    finally:
+        db.close()
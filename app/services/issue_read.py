@@ -0,0 +1,141 @@
+# app/services/issue_read.py
+"""
+Read path for issue lists.
+
+One SQL statement returns each issue together with its creator, assignee and
+aggregated photo URLs (list-size thumbnails where they exist); rows are serialized straight to JSON bytes without
+building ORM objects or running Pydantic validation per item.
+"""
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import aliased
+
+from app.models.attachment import IssueAttachment, IssueAttachmentVariant
+from app.models.issue import Issue
+from app.models.user import User
+from app.services.images import LIST_VARIANT
+
+STAFF_ROLES = ("super_admin", "admin", "staff")
+
+
+def issue_list_select():
+    """SELECT of issue columns + creator/assignee + photo URL array, unfiltered and unordered."""
+    creator = aliased(User, name="creator")
+    assignee = aliased(User, name="assignee")
+    thumb = aliased(IssueAttachmentVariant, name="thumb")
+    photo_url = func.coalesce(thumb.url, IssueAttachment.url)
+    photos = (
+        select(func.array_agg(aggregate_order_by(photo_url, IssueAttachment.id)))
+        .select_from(IssueAttachment)
+        .outerjoin(
+            thumb,
+            and_(thumb.attachment_id == IssueAttachment.id, thumb.kind == LIST_VARIANT),
+        )
+        .where(IssueAttachment.issue_id == Issue.id)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Issue.id,
+            Issue.title,
+            Issue.description,
+            Issue.category,
+            Issue.status,
+            Issue.lat,
+            Issue.lng,
+            Issue.address,
+            Issue.country,
+            Issue.state_code,
+            Issue.created_at,
+            Issue.updated_at,
+            Issue.in_progress_at,
+            Issue.resolved_at,
+            Issue.assigned_to_id,
+            creator.id.label("creator_id"),
+            creator.name.label("creator_name"),
+            creator.email.label("creator_email"),
+            creator.role.label("creator_role"),
+            assignee.id.label("assignee_id"),
+            assignee.name.label("assignee_name"),
+            assignee.email.label("assignee_email"),
+            assignee.role.label("assignee_role"),
+            photos.label("photos"),
+        )
+        .outerjoin(creator, creator.id == Issue.created_by_id)
+        .outerjoin(assignee, assignee.id == Issue.assigned_to_id)
+    )
+
+
+def _iso(value: datetime | None) -> str | None:
+    """ISO 8601 as Pydantic serializes datetimes: UTC is written as "Z"."""
+    if value is None:
+        return None
+    s = value.isoformat()
+    return s[:-6] + "Z" if s.endswith("+00:00") else s
+
+
+def _enum_value(value):
+    return value.value if hasattr(value, "value") else value
+
+
+def issue_rows_to_items(rows, viewer: User | None) -> list[dict]:
+    """
+    Shape rows from issue_list_select() like IssueOut, applying email privacy.
+
+    Staff roles see every email; other signed-in users only see their own.
+    """
+    viewer_id = viewer.id if viewer else None
+    viewer_is_staff = bool(viewer) and _enum_value(viewer.role) in STAFF_ROLES
+
+    items = []
+    for r in rows:
+        creator = None
+        if r.creator_id is not None:
+            creator = {
+                "id": r.creator_id,
+                "name": r.creator_name,
+                "email": r.creator_email
+                if viewer_is_staff or r.creator_id == viewer_id
+                else None,
+                "role": _enum_value(r.creator_role),
+            }
+        assigned_to = None
+        if r.assignee_id is not None:
+            assigned_to = {
+                "id": r.assignee_id,
+                "name": r.assignee_name,
+                "email": r.assignee_email
+                if viewer_is_staff or r.assignee_id == viewer_id
+                else None,
+                "role": _enum_value(r.assignee_role),
+            }
+        items.append(
+            {
+                "id": r.id,
+                "title": r.title,
+                "description": r.description,
+                "category": r.category,
+                "status": _enum_value(r.status),
+                "lat": r.lat,
+                "lng": r.lng,
+                "address": r.address,
+                "country": r.country,
+                "state_code": r.state_code,
+                "created_at": _iso(r.created_at),
+                "updated_at": _iso(r.updated_at),
+                "in_progress_at": _iso(r.in_progress_at),
+                "resolved_at": _iso(r.resolved_at),
+                "assigned_to_id": r.assigned_to_id,
+                "creator": creator,
+                "assigned_to": assigned_to,
+                "photos": r.photos or [],
+            }
+        )
+    return items
+
+
+def dump_json(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
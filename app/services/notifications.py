@@ -0,0 +1,309 @@
+# app/services/notifications.py
+"""
+Issue notifications through the transactional outbox.
+
+Routers call `enqueue(db, event, **payload)` before committing, so an event
+is recorded exactly when the change it describes is. The worker
+(app/workers/notifications.py) then:
+
+- `expand`s each event into one outbox row per email / push delivery.
+  Recipients, their notification_preferences and push subscriptions are
+  resolved at that point with one query (`resolve_recipients`); admins get
+  comments on unrelated issues while watch_all_comments is on (the migration
+  turns it on for existing admins).
+  With AppSettings.features {"email_digest": true, "email_digest_minutes": n}
+  comment / status / assignment emails are buffered per recipient instead
+  and `flush_digests` turns each recipient's buffer into one email once the
+  oldest entry has waited n minutes.
+- sends those rows in batches: emails over pooled SMTP sessions with
+  `deliver_emails`, pushes concurrently with `deliver_pushes`. Failures are reported per row, so each
+  delivery is retried on its own without re-sending to everyone else.
+"""
+import logging
+from datetime import timedelta
+
+from pywebpush import WebPushException
+from sqlalchemy import and_, delete, func, or_, select, true
+from sqlalchemy.orm import Session
+
+from app.models.app_settings import AppSettings
+from app.models.issue import Issue
+from app.models.notification_digest import NotificationDigestItem
+from app.models.notification_outbox import NotificationOutbox
+from app.models.notification_preference import NotificationPreference
+from app.models.push import PushSubscription
+from app.models.user import User, UserRole
+from app.services import notify_email
+from app.services.notify_push import dispatcher
+
+EMAIL_TEMPLATES = {
+    "report_confirmation": notify_email.send_report_confirmation,
+    "status_update": notify_email.send_status_update,
+    "comment": notify_email.send_comment_notification,
+    "assignment": notify_email.send_assignment_notification,
+    "digest": notify_email.send_digest,
+}
+# held back and coalesced per recipient in digest mode
+DIGEST_TEMPLATES = {"comment", "status_update", "assignment"}
+DEFAULT_DIGEST_MINUTES = 15
+
+
+def enqueue(db: Session, event: str, **payload):
+    """Record an event in the caller's transaction (must be one of EVENTS)."""
+    if event not in EVENTS:
+        raise ValueError(f"Unknown notification event: {event}")
+    db.add(NotificationOutbox(kind=event, payload=payload))
+
+
+def _email(template: str, to: str, **args) -> tuple[str, dict]:
+    return "email", {"template": template, "to": to, "args": args}
+
+
+def resolve_recipients(db: Session, user_ids, *, watchers: bool = False, exclude: int | None = None):
+    """
+    Active users among `user_ids` (plus, with `watchers`, admins who opted in
+    to all comments) with their preferences and push subscription ids, in one
+    query. Rows have id, email, email_enabled, push_enabled, subscription_ids.
+    """
+    pref = NotificationPreference
+    who = User.id.in_([u for u in user_ids if u])
+    if watchers:
+        who = or_(
+            who,
+            and_(
+                User.role.in_((UserRole.admin, UserRole.super_admin)),
+                pref.watch_all_comments.is_(True),
+            ),
+        )
+    q = (
+        select(
+            User.id,
+            User.email,
+            func.coalesce(pref.email_enabled, true()).label("email_enabled"),
+            func.coalesce(pref.push_enabled, true()).label("push_enabled"),
+            func.array_agg(PushSubscription.id)
+            .filter(PushSubscription.id.is_not(None))
+            .label("subscription_ids"),
+        )
+        .outerjoin(pref, pref.user_id == User.id)
+        .outerjoin(PushSubscription, PushSubscription.user_id == User.id)
+        .where(who, User.is_active.is_(True))
+        .group_by(User.id, pref.user_id)
+        .order_by(User.id)
+    )
+    if exclude is not None:
+        q = q.where(User.id != exclude)
+    return db.execute(q).all()
+
+
+def _fan_out(recipients, email: tuple[str, dict] | None = None, push: tuple[str, str] | None = None) -> list:
+    """Deliveries of `email` (template, args) and `push` (title, body) to every recipient accepting them."""
+    out = []
+    for r in recipients:
+        if email and r.email and r.email_enabled:
+            out.append(_email(email[0], r.email, **email[1]))
+        if push and r.push_enabled:
+            message = {"title": push[0], "body": push[1]}
+            out += [("push", {"subscription_id": sid, "message": message}) for sid in r.subscription_ids or ()]
+    return out
+
+
+def _flags(db: Session) -> tuple[bool, bool]:
+    """(auto email, push enabled) from AppSettings."""
+    s = db.query(AppSettings).first()
+    if not s:
+        return True, False
+    return s.auto_email_on_status_change, s.push_notifications_enabled
+
+
+def _issue_created(db: Session, issue_id: int) -> list:
+    issue = db.get(Issue, issue_id)
+    if not issue or not issue.created_by_id:
+        return []
+    return _fan_out(
+        resolve_recipients(db, [issue.created_by_id]),
+        email=("report_confirmation", {"issue_id": issue.id, "title": issue.title}),
+    )
+
+
+def _issue_assigned(db: Session, issue_id: int, assigned_id: int | None, assigner_id: int, old_assigned_id: int | None) -> list:
+    if assigned_id is None or assigned_id == old_assigned_id:
+        return []
+    issue = db.get(Issue, issue_id)
+    if not issue:
+        return []
+    assigner = db.get(User, assigner_id)
+    assigner_name = (assigner.name or assigner.email) if assigner else None
+    assigner_name = assigner_name or "Admin"
+    auto_email, push_enabled = _flags(db)
+    return _fan_out(
+        resolve_recipients(db, [assigned_id]),
+        email=("assignment", {"issue_id": issue.id, "issue_title": issue.title, "assigned_by": assigner_name}) if auto_email else None,
+        push=("Issue Assigned", f"Issue #{issue.id} assigned to you by {assigner_name}") if push_enabled else None,
+    )
+
+
+def _issue_status(db: Session, issue_id: int, new_status: str, changer_id: int) -> list:
+    issue = db.get(Issue, issue_id)
+    send_emails, _ = _flags(db)
+    if not issue or not send_emails:
+        return []
+    user_ids = [issue.created_by_id]
+    if new_status in ("in_progress", "resolved"):
+        user_ids.append(issue.assigned_to_id)
+    return _fan_out(
+        resolve_recipients(db, user_ids),
+        email=("status_update", {"issue_id": issue.id, "status": new_status}),
+        push=("Improve My City", f"Issue #{issue.id} is now {new_status.replace('_', ' ')}"),
+    )
+
+
+def _issue_comment(db: Session, issue_id: int, comment_author_id: int, comment_body: str) -> list:
+    issue = db.get(Issue, issue_id)
+    author = db.get(User, comment_author_id)
+    if not issue or not author:
+        return []
+    author_name = author.name or author.email or "Anonymous"
+    auto_email, push_enabled = _flags(db)
+    recipients = resolve_recipients(
+        db, [issue.created_by_id, issue.assigned_to_id], watchers=True, exclude=author.id
+    )
+    return _fan_out(
+        recipients,
+        email=("comment", {
+            "issue_id": issue.id,
+            "issue_title": issue.title,
+            "comment_author": author_name,
+            "comment_body": comment_body,
+        }) if auto_email else None,
+        push=("New Comment", f"{author_name} commented on issue #{issue.id}") if push_enabled else None,
+    )
+
+
+EVENTS = {
+    "issue_created": _issue_created,
+    "issue_assigned": _issue_assigned,
+    "issue_status": _issue_status,
+    "issue_comment": _issue_comment,
+}
+
+
+def digest_window(app_settings) -> int | None:
+    """Digest window in seconds from AppSettings.features, None when digest mode is off."""
+    features = getattr(app_settings, "features", None) or {}
+    if not features.get("email_digest"):
+        return None
+    return int(features.get("email_digest_minutes") or DEFAULT_DIGEST_MINUTES) * 60
+
+
+def expand(db: Session, event: str, payload: dict) -> list:
+    """
+    Rows to insert for one event: an outbox row per delivery, except that in
+    digest mode comment / status / assignment emails become digest items.
+    """
+    deliveries = EVENTS[event](db, **payload)
+    digest = any(kind == "email" and p["template"] in DIGEST_TEMPLATES for kind, p in deliveries)
+    if digest:
+        digest = digest_window(db.query(AppSettings).first()) is not None
+    rows = []
+    for kind, p in deliveries:
+        if digest and kind == "email" and p["template"] in DIGEST_TEMPLATES:
+            rows.append(NotificationDigestItem(to_email=p["to"], template=p["template"], args=p["args"]))
+        else:
+            rows.append(NotificationOutbox(kind=kind, payload=p))
+    return rows
+
+
+def flush_digests(db: Session) -> int:
+    """
+    Coalesce the digest items of every recipient whose oldest item has waited
+    a full window into one email delivery (a lone item keeps its own
+    template). Runs in the caller's transaction; returns the emails queued.
+    With digest mode off, whatever is still buffered is flushed at once.
+    """
+    window = digest_window(db.query(AppSettings).first()) or 0
+    item = NotificationDigestItem
+    due = (
+        select(item.to_email)
+        .group_by(item.to_email)
+        .having(func.min(item.created_at) <= func.now() - timedelta(seconds=window))
+    )
+    # concurrent flushers block on the same rows and then skip them, so
+    # every item is taken exactly once
+    taken = db.execute(
+        delete(item)
+        .where(item.to_email.in_(due))
+        .returning(item.to_email, item.template, item.args, item.created_at)
+    ).all()
+
+    by_recipient: dict[str, list] = {}
+    for row in sorted(taken, key=lambda r: r.created_at):
+        by_recipient.setdefault(row.to_email, []).append(row)
+    for to, rows in by_recipient.items():
+        if len(rows) == 1:
+            payload = {"template": rows[0].template, "to": to, "args": rows[0].args}
+        else:
+            items = [{"template": r.template, "args": r.args, "at": r.created_at.isoformat()} for r in rows]
+            payload = {"template": "digest", "to": to, "args": {"items": items}}
+        db.add(NotificationOutbox(kind="email", payload=payload))
+    return len(by_recipient)
+
+
+def deliver(db: Session, kind: str, payload: dict):
+    """Send one email delivery; raises on failure (batches go through deliver_emails / deliver_pushes)."""
+    if kind == "email":
+        EMAIL_TEMPLATES[payload["template"]](payload["to"], **payload["args"])
+    else:
+        raise ValueError(f"Unknown delivery kind: {kind}")
+
+
+def deliver_emails(rows) -> dict[int, Exception | None]:
+    """Send a batch of email delivery rows over shared SMTP sessions; {row id: error or None}."""
+    results: dict[int, Exception | None] = {}
+    queued = []
+    with notify_email.batch() as b:
+        for row in rows:
+            try:
+                EMAIL_TEMPLATES[row.payload["template"]](row.payload["to"], **row.payload["args"])
+                queued.append(row.id)
+            except Exception as e:
+                results[row.id] = e
+    results.update(zip(queued, b.errors))
+    return results
+
+
+def _subscription_info(sub: PushSubscription) -> dict:
+    return {"endpoint": sub.endpoint, "keys": {"p256dh": sub.p256dh, "auth": sub.auth}}
+
+
+def deliver_pushes(db: Session, rows) -> dict[int, Exception | None]:
+    """
+    Send a batch of push delivery rows concurrently; {row id: error or None}.
+
+    Subscriptions whose endpoint is gone (404/410) are deleted in the caller's
+    transaction and their deliveries count as done.
+    """
+    sub_ids = {row.payload["subscription_id"] for row in rows}
+    subs = {
+        s.id: s
+        for s in db.query(PushSubscription).filter(PushSubscription.id.in_(sub_ids)).all()
+    }
+    # rows whose subscription was removed since the event was expanded are done
+    results: dict[int, Exception | None] = {row.id: None for row in rows}
+    sendable = [row for row in rows if row.payload["subscription_id"] in subs]
+    if not dispatcher.enabled or not sendable:
+        return results
+
+    report = dispatcher.send_many([
+        (_subscription_info(subs[row.payload["subscription_id"]]), row.payload["message"])
+        for row in sendable
+    ])
+    for row, result in zip(sendable, report.results):
+        if result.outcome == "failed":
+            results[row.id] = WebPushException(f"Push failed: {result.error}")
+
+    gone = report.gone()
+    if gone:
+        db.query(PushSubscription).filter(PushSubscription.endpoint.in_(gone)).delete(synchronize_session=False)
+    logging.info(report.summary() + (f", pruned {len(gone)} subscription(s)" if gone else ""))
+    return results
@@ -1,6 +1,12 @@
 # app/services/notify_email.py
 
+import atexit
 import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from html import escape
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional
@@ -95,34 +101,154 @@ def _get_template_base():
 
 
 # ===================================================================
-# Helper: send email via SMTP
+# Helper: SMTP connection pool
 # ===================================================================
 
-def _send_email_via_smtp(to_email: str, subject: str, html_content: str):
-    """Send an email using SMTP with proper SSL/TLS handling."""
-    if not SMTP_HOST or not SMTP_USERNAME or not SMTP_PASSWORD or not FROM_ADDR:
-        return
+SMTP_POOL_SIZE = 4
+SMTP_TIMEOUT = 15
+SMTP_NOOP_AFTER = 10  # seconds idle before a pooled session is health-checked
+SMTP_IDLE_TIMEOUT = 120  # seconds idle before a pooled session is dropped
+SMTP_SESSION_BATCH = 20  # messages sent back-to-back on one session
 
-    try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = f"{FROM_NAME} <{FROM_ADDR}>" if FROM_NAME else FROM_ADDR
-        msg["To"] = to_email
-        
-        html_part = MIMEText(html_content, "html")
-        msg.attach(html_part)
 
+class SMTPPool:
+    """
+    Thread-safe pool of logged-in SMTP sessions.
+
+    Sessions are reused across sends (one TLS + AUTH handshake per session,
+    not per email), checked with NOOP after being idle, and replaced when the
+    server has dropped them. A session is used by one thread at a time; at
+    most `size` are open at once.
+    """
+
+    def __init__(self, size: int = SMTP_POOL_SIZE):
+        self._idle: list[tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="smtp")
+
+    def _connect(self) -> smtplib.SMTP:
         if SMTP_USE_SSL:
-            server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=15)
+            server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
         else:
-            server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=15)
+            server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
             server.starttls()
-
         server.login(SMTP_USERNAME, SMTP_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-    except Exception as e:
-        print(f"Failed to send email via SMTP: {e}")
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _checkout(self) -> smtplib.SMTP:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, last_used = self._idle.pop()
+            idle = time.monotonic() - last_used
+            if idle > SMTP_IDLE_TIMEOUT:
+                self._close(server)
+                continue
+            if idle > SMTP_NOOP_AFTER:
+                try:
+                    alive = server.noop()[0] == 250
+                except Exception:
+                    alive = False
+                if not alive:
+                    self._close(server)
+                    continue
+            return server
+        return self._connect()
+
+    def _checkin(self, server: smtplib.SMTP):
+        with self._lock:
+            self._idle.append((server, time.monotonic()))
+
+    def _send_session(self, messages: list) -> list[Exception | None]:
+        errors: list[Exception | None] = []
+        with self._slots:
+            server = None
+            try:
+                for msg in messages:
+                    for attempt in (1, 2):
+                        try:
+                            if server is None:
+                                server = self._checkout()
+                            server.send_message(msg)
+                            errors.append(None)
+                            break
+                        except (smtplib.SMTPServerDisconnected, OSError) as e:
+                            # dropped session: reconnect once, then give up on this message
+                            if server is not None:
+                                server.close()
+                                server = None
+                            if attempt == 2:
+                                errors.append(e)
+                        except smtplib.SMTPException as e:
+                            errors.append(e)  # refused by the server; the session stays usable
+                            break
+                        except Exception as e:
+                            # e.g. a message that cannot be encoded: fail only this one and
+                            # start the next on a fresh session, this one's state is unknown
+                            errors.append(e)
+                            if server is not None:
+                                server.close()
+                                server = None
+                            break
+            finally:
+                if server is not None:
+                    self._checkin(server)
+        return errors
+
+    def send_many(self, messages: list) -> list[Exception | None]:
+        """Send MIME messages; returns one error (or None) per message, in order."""
+        chunks = [messages[i:i + SMTP_SESSION_BATCH] for i in range(0, len(messages), SMTP_SESSION_BATCH)]
+        if len(chunks) <= 1:
+            return self._send_session(messages) if messages else []
+        return [err for errs in self._executor.map(self._send_session, chunks) for err in errs]
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+
+
+_smtp_pool = SMTPPool()
+atexit.register(_smtp_pool.close_all)
+
+
+def _smtp_configured() -> bool:
+    return bool(SMTP_HOST and SMTP_USERNAME and SMTP_PASSWORD and FROM_ADDR)
+
+
+def _build_message(to_email: str, subject: str, html_content: str) -> MIMEMultipart:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = f"{FROM_NAME} <{FROM_ADDR}>" if FROM_NAME else FROM_ADDR
+    msg["To"] = to_email
+    msg.attach(MIMEText(html_content, "html"))
+    return msg
+
+
+# ===================================================================
+# Helper: send email via SMTP
+# ===================================================================
+
+def _send_email_via_smtp(to_email: str, subject: str, html_content: str):
+    """Send an email over a pooled SMTP session."""
+    if not _smtp_configured():
+        return
+
+    error = _smtp_pool.send_many([_build_message(to_email, subject, html_content)])[0]
+    if error is not None:
+        import logging
+        logging.error(f"Failed to send email via SMTP: {error}")
+        raise error
 
 
 # ===================================================================
@@ -145,16 +271,73 @@ def _send_email_via_resend(to_email: str, subject: str, html_content: str):
         resend.Emails.send(params)
     except Exception as e:
         import logging
-        logging.error(f"Failed to send email via Resend: {e}", exc_info=True)
+        logging.error(f"Failed to send email via Resend: {e}")
+        raise
 
 
 # ===================================================================
 # Main email sending function (routes to appropriate provider)
 # ===================================================================
 
-def _send_email(to_email: str, subject: str, html_content: str):
-    """Send an email using the configured provider (SMTP or Resend)."""
+_batch = threading.local()
+
+
+class EmailBatch:
+    def __init__(self):
+        self.messages: list[tuple[str, str, str]] = []  # (to, subject, html)
+        self.errors: list[Exception | None] = []
+
+
+@contextmanager
+def batch():
+    """
+    Collect the emails sent by send_* calls inside the block (in this thread)
+    and deliver them together on exit: over SMTP they share pooled sessions.
+    Afterwards `.errors` holds one error (or None) per collected message.
+    """
+    b = EmailBatch()
+    _batch.current = b
+    try:
+        yield b
+    finally:
+        _batch.current = None
+    b.errors = _send_many(b.messages)
+
+
+def _send_many(messages: list[tuple[str, str, str]]) -> list[Exception | None]:
     if EMAIL_PROVIDER == "resend":
+        errors = []
+        for message in messages:
+            try:
+                _send_email_via_resend(*message)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+    if not _smtp_configured():
+        return [None] * len(messages)
+    errors: list[Exception | None] = [None] * len(messages)
+    built = []
+    for i, m in enumerate(messages):
+        try:
+            built.append((i, _build_message(*m)))
+        except Exception as e:
+            errors[i] = e
+    for (i, _), e in zip(built, _smtp_pool.send_many([msg for _, msg in built])):
+        errors[i] = e
+    failed = sum(e is not None for e in errors)
+    if failed:
+        import logging
+        logging.error(f"Failed to send {failed} of {len(messages)} email(s) via SMTP")
+    return errors
+
+
+def _send_email(to_email: str, subject: str, html_content: str):
+    """Send an email using the configured provider (SMTP or Resend); raises on failure."""
+    current = getattr(_batch, "current", None)
+    if current is not None:
+        current.messages.append((to_email, subject, html_content))
+    elif EMAIL_PROVIDER == "resend":
         _send_email_via_resend(to_email, subject, html_content)
     else:
         _send_email_via_smtp(to_email, subject, html_content)
@@ -413,4 +596,62 @@ def send_assignment_notification(to_email: str, issue_id: int, issue_title: str,
     """
 
     html = _get_template_base() % html_content
-    _send_email(actual_recipient, f"Issue #{issue_id} assigned to you", html)
\ No newline at end of file
+    _send_email(actual_recipient, f"Issue #{issue_id} assigned to you", html)
+
+# ===================================================================
+# 7) Notification digest
+# ===================================================================
+
+def _digest_line(template: str, args: dict) -> str:
+    if template == "comment":
+        body = args["comment_body"]
+        body = escape(body[:200]) + ("..." if len(body) > 200 else "")
+        return f"<strong>{escape(args['comment_author'])}</strong> commented: {body}"
+    if template == "status_update":
+        return f"Status changed to <strong>{args['status'].replace('_', ' ').title()}</strong>"
+    if template == "assignment":
+        return f"Assigned to you by <strong>{escape(args['assigned_by'])}</strong>"
+    return escape(template)
+
+
+def send_digest(to_email: str, items: list[dict]):
+    """
+    One email summarising several held-back notifications.
+
+    `items` are {"template", "args", "at"} dicts of the comment / status_update /
+    assignment notifications above, oldest first; they are grouped per issue.
+    """
+    actual_recipient, redirect_note = _get_recipient_and_note(to_email)
+
+    issues: dict[int, dict] = {}
+    for item in items:
+        args = item["args"]
+        entry = issues.setdefault(args["issue_id"], {"title": None, "lines": []})
+        entry["title"] = entry["title"] or args.get("issue_title")
+        entry["lines"].append(_digest_line(item["template"], args))
+
+    sections = []
+    for issue_id, entry in issues.items():
+        title = f" – {escape(entry['title'])}" if entry["title"] else ""
+        lines = "".join(f"<li style=\"margin:2px 0;\">{line}</li>" for line in entry["lines"])
+        link = _build_url(f"issues/{issue_id}")
+        sections.append(f"""
+        <p style="margin:12px 0 4px 0;"><strong>Issue #{issue_id}</strong>{title}</p>
+        <ul style="margin:0 0 4px 18px;padding:0;">{lines}</ul>
+        <a href="{link}" style="font-size:12px;color:#1d4ed8;">View issue #{issue_id}</a>
+        """)
+
+    html_content = f"""
+    {redirect_note}
+    <p>Hello,</p>
+    <p>Here is what happened on your issues in <strong>Improve My City</strong>
+       since our last update:</p>
+    {"".join(sections)}
+    <p style="margin-top:12px;font-size:12px;color:#6b7280;">
+      Updates are grouped into one email while digest mode is enabled.
+    </p>
+    """
+
+    html = _get_template_base() % html_content
+    count = len(items)
+    _send_email(actual_recipient, f"{count} update{'s' if count != 1 else ''} on {len(issues)} issue{'s' if len(issues) != 1 else ''}", html)
@@ -1,25 +1,166 @@
 # app/services/notify_push.py
+"""
+Web push delivery.
 
+`dispatcher.send_many` sends a batch concurrently on PUSH_WORKERS threads
+sharing one pooled keep-alive session. VAPID Authorization headers are
+signed once per push service origin and reused until shortly before they
+expire. Endpoints answering 404/410 are reported as "gone" so the caller can
+delete the subscription.
+"""
 import json
-from pywebpush import webpush, WebPushException
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from py_vapid import Vapid
+from pywebpush import WebPusher, WebPushException
+from requests.adapters import HTTPAdapter
+
 from app.core.config import settings
 
 VAPID_PRIVATE = settings.vapid_private_key
 VAPID_PUBLIC = settings.vapid_public_key   # still needed for frontend
 VAPID_CLAIMS = {"sub": settings.vapid_sub}
 
+PUSH_WORKERS = 16
+TIMEOUT = (5, 15)  # connect, read
+VAPID_TTL = 12 * 3600  # the longest push services accept
+VAPID_RENEW = 3600  # re-sign when less than this is left
+GONE_STATUSES = {404, 410}
+
+
+class PushResult:
+    __slots__ = ("endpoint", "outcome", "status", "latency_ms", "error")
+
+    def __init__(self, endpoint: str, outcome: str, status: int | None, latency_ms: float, error: str | None = None):
+        self.endpoint = endpoint
+        self.outcome = outcome  # "sent", "gone" or "failed"
+        self.status = status
+        self.latency_ms = latency_ms
+        self.error = error
 
-def send_push(subscription: dict, payload: dict):
-    if not VAPID_PRIVATE or not VAPID_PUBLIC:
-        return
 
-    try:
-        webpush(
-            subscription_info=subscription,
-            data=json.dumps(payload),
-            vapid_private_key=VAPID_PRIVATE,
-            vapid_claims=VAPID_CLAIMS
+class PushReport:
+    def __init__(self, results: list[PushResult]):
+        self.results = results
+
+    def counts(self) -> dict[str, int]:
+        out = {"sent": 0, "gone": 0, "failed": 0}
+        for r in self.results:
+            out[r.outcome] += 1
+        return out
+
+    def gone(self) -> list[str]:
+        return [r.endpoint for r in self.results if r.outcome == "gone"]
+
+    def by_origin(self) -> dict[str, dict]:
+        """{push service origin: {"count", "avg_ms", "max_ms"}}"""
+        groups: dict[str, list[float]] = {}
+        for r in self.results:
+            groups.setdefault(_origin(r.endpoint), []).append(r.latency_ms)
+        return {
+            origin: {
+                "count": len(ms),
+                "avg_ms": round(sum(ms) / len(ms), 1),
+                "max_ms": round(max(ms), 1),
+            }
+            for origin, ms in groups.items()
+        }
+
+    def summary(self) -> str:
+        counts = ", ".join(f"{k}={v}" for k, v in self.counts().items())
+        origins = ", ".join(
+            f"{o} {s['count']}x avg {s['avg_ms']}ms max {s['max_ms']}ms"
+            for o, s in self.by_origin().items()
         )
-    except WebPushException as e:
-        import logging
-        logging.error(f"Push notification failed: {e}", exc_info=True)
\ No newline at end of file
+        return f"push batch: {counts}" + (f" ({origins})" if origins else "")
+
+
+def _origin(endpoint: str) -> str:
+    u = urlparse(endpoint)
+    return f"{u.scheme}://{u.netloc}"
+
+
+def _load_vapid(private_key: str) -> Vapid:
+    """VAPID_PRIVATE_KEY may be the key itself or a path to a key file, as with pywebpush.webpush."""
+    if os.path.isfile(private_key):
+        return Vapid.from_file(private_key_file=private_key)
+    return Vapid.from_string(private_key=private_key)
+
+
+class PushDispatcher:
+    def __init__(self, private_key: str | None, claims: dict):
+        self.enabled = bool(private_key and VAPID_PUBLIC)
+        self._private_key = private_key
+        self._vapid = None  # parsed on first use, a bad key should not break imports
+        self._claims = claims
+        self._headers: dict[str, tuple[dict, int]] = {}  # origin -> (headers, exp)
+        self._lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=PUSH_WORKERS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=PUSH_WORKERS, thread_name_prefix="push")
+
+    def vapid_headers(self, origin: str) -> dict:
+        now = int(time.time())
+        cached = self._headers.get(origin)
+        if cached and cached[1] - now > VAPID_RENEW:
+            return cached[0]
+        with self._lock:
+            cached = self._headers.get(origin)
+            if not cached or cached[1] - now <= VAPID_RENEW:
+                if self._vapid is None:
+                    self._vapid = _load_vapid(self._private_key)
+                exp = now + VAPID_TTL
+                claims = {**self._claims, "aud": origin, "exp": exp}
+                cached = (self._vapid.sign(claims), exp)
+                self._headers[origin] = cached
+        return cached[0]
+
+    def send_one(self, subscription: dict, payload: dict) -> PushResult:
+        endpoint = subscription.get("endpoint", "")
+        started = time.perf_counter()
+        status, error = None, None
+        try:
+            response = WebPusher(subscription, requests_session=self.session).send(
+                json.dumps(payload),
+                dict(self.vapid_headers(_origin(endpoint))),
+                timeout=TIMEOUT,
+            )
+            status = response.status_code
+            if status > 202:
+                error = f"{status} {response.reason}"
+        except (WebPushException, requests.RequestException, ValueError) as e:
+            error = str(e)
+        latency_ms = (time.perf_counter() - started) * 1000
+        if status in GONE_STATUSES:
+            outcome = "gone"
+        elif error:
+            outcome = "failed"
+        else:
+            outcome = "sent"
+        return PushResult(endpoint, outcome, status, latency_ms, error)
+
+    def send_many(self, messages: list[tuple[dict, dict]]) -> PushReport:
+        """Send (subscription info, payload) pairs concurrently; results in input order."""
+        if not self.enabled or not messages:
+            return PushReport([])
+        results = list(self._executor.map(lambda m: self.send_one(*m), messages))
+        return PushReport(results)
+
+
+dispatcher = PushDispatcher(VAPID_PRIVATE, VAPID_CLAIMS)
+
+
+def send_push(subscription: dict, payload: dict):
+    """Send one message; raises WebPushException unless it was accepted."""
+    if not dispatcher.enabled:
+        return
+    result = dispatcher.send_one(subscription, payload)
+    if result.outcome != "sent":
+        raise WebPushException(f"Push failed: {result.error}")
@@ -0,0 +1,126 @@
+# app/services/response_cache.py
+"""
+Response cache for issue list and map queries.
+
+Entries are serialized response bodies (plus their ETag) keyed by a
+namespace and a dict of normalized filters + viewer class. Every issue
+write that can change a list or map response calls `invalidate()`, which
+bumps a generation number baked into all keys, so stale entries simply
+stop being addressed.
+
+By default the cache lives in-process (each worker invalidates only its own
+copy; other workers converge within RESPONSE_CACHE_TTL). Setting
+RESPONSE_CACHE_URL to a Redis URL shares entries and invalidations across
+workers; the `redis` package is then required.
+"""
+import hashlib
+import json
+import logging
+import threading
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:  # optional, only needed for a shared cache
+    redis = None
+
+TTL = settings.response_cache_ttl
+MAXSIZE = 2048
+GENERATION_KEY = "imc:rc:generation"
+
+_local = TTLCache(maxsize=MAXSIZE, ttl=TTL)
+_lock = threading.Lock()
+_generation = 0
+_counters = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0, "errors": 0}
+
+_redis = None
+if settings.response_cache_url:
+    if redis is None:
+        logging.warning("RESPONSE_CACHE_URL is set but redis is not installed; using in-process cache")
+    else:
+        _redis = redis.Redis.from_url(settings.response_cache_url)
+
+
+def _count(name: str):
+    with _lock:
+        _counters[name] += 1
+
+
+def _key(namespace: str, key: dict, generation: int) -> str:
+    raw = json.dumps([namespace, key], sort_keys=True, default=str)
+    return f"imc:rc:{generation}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def _current_generation() -> int:
+    if _redis is not None:
+        return int(_redis.get(GENERATION_KEY) or 0)
+    return _generation
+
+
+def lookup(namespace: str, key: dict) -> tuple[str | None, tuple[bytes, str | None] | None]:
+    """
+    Return (cache_key, cached (body, etag) or None).
+
+    Pass cache_key back to store(): it pins the generation seen before the
+    response was computed, so a write that lands mid-request is not masked.
+    """
+    try:
+        cache_key = _key(namespace, key, _current_generation())
+        if _redis is not None:
+            raw = _redis.get(cache_key)
+            value = None
+            if raw is not None:
+                etag, _, body = raw.partition(b"\n")
+                value = (body, etag.decode() or None)
+        else:
+            value = _local.get(cache_key)
+    except Exception as e:
+        logging.warning(f"Response cache read failed: {e}")
+        _count("errors")
+        return None, None
+    _count("hits" if value is not None else "misses")
+    return cache_key, value
+
+
+def store(cache_key: str | None, body: bytes, etag: str | None = None):
+    if cache_key is None:
+        return
+    try:
+        if _redis is not None:
+            _redis.set(cache_key, (etag or "").encode() + b"\n" + body, ex=int(TTL))
+        else:
+            _local.set(cache_key, (body, etag))
+        _count("stores")
+    except Exception as e:
+        logging.warning(f"Response cache write failed: {e}")
+        _count("errors")
+
+
+def invalidate():
+    """Drop every cached issue list / map response (call after issue writes commit)."""
+    global _generation
+    try:
+        if _redis is not None:
+            _redis.incr(GENERATION_KEY)
+        else:
+            with _lock:
+                _generation += 1
+            _local.clear()
+        _count("invalidations")
+    except Exception as e:
+        logging.warning(f"Response cache invalidation failed: {e}")
+        _count("errors")
+
+
+def stats() -> dict:
+    with _lock:
+        counters = dict(_counters)
+    lookups = counters["hits"] + counters["misses"]
+    counters["hit_ratio"] = round(counters["hits"] / lookups, 4) if lookups else None
+    counters["backend"] = "redis" if _redis is not None else "memory"
+    counters["ttl"] = TTL
+    if _redis is None:
+        counters["size"] = _local.stats()["size"]
+    return counters
@@ -0,0 +1,48 @@
+# app/services/search.py
+"""
+Issue search backed by Postgres full-text and trigram indexes.
+
+- issues.search_vector: generated tsvector over title (A), address (B) and
+  description (C) with a GIN index; words are matched by prefix.
+- pg_trgm GIN indexes on title and address make the ILIKE '%term%'
+  fallback (partial words, house numbers, misspelt localities) indexable.
+"""
+import re
+
+from sqlalchemy import func, or_
+
+from app.models.issue import Issue
+
+TS_CONFIG = "simple"
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _prefix_tsquery(search: str):
+    tokens = _TOKEN.findall(search.lower())
+    if not tokens:
+        return None
+    return func.to_tsquery(TS_CONFIG, " & ".join(f"{t}:*" for t in tokens))
+
+
+def search_filter(search: str):
+    """WHERE clause matching `search` against an issue's id, text and address."""
+    term = f"%{search}%"
+    clauses = [Issue.title.ilike(term), Issue.address.ilike(term)]
+    tsquery = _prefix_tsquery(search)
+    if tsquery is not None:
+        clauses.append(Issue.search_vector.op("@@")(tsquery))
+    if search.isdigit():
+        clauses.append(Issue.id == int(search))
+    return or_(*clauses)
+
+
+def search_rank(search: str):
+    """Relevance score for ordering search results (higher is better)."""
+    similarity = func.greatest(
+        func.similarity(Issue.title, search),
+        func.coalesce(func.similarity(Issue.address, search), 0),
+    )
+    tsquery = _prefix_tsquery(search)
+    if tsquery is None:
+        return similarity
+    return func.ts_rank_cd(Issue.search_vector, tsquery) + similarity
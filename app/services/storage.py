@@ -1,29 +1,314 @@
 #app\services\storage.py
-import requests, uuid
+"""
+Photo storage.
+
+Two backends implement the same small interface:
+
+- SupabaseBackend: Supabase Storage over REST. All requests share one pooled
+  keep-alive `requests.Session`, transient failures are retried with
+  exponential backoff, and clients can upload straight to the bucket through
+  signed upload URLs (`create_upload_target` / `stat_object`).
+  scripts/local_storage_server.py implements the same REST subset locally.
+- FilesystemBackend: content-addressed files under MEDIA_ROOT, named by the
+  SHA-256 of their bytes (identical photos are stored once) and served by
+  app/routers/media.py at MEDIA_BASE_URL/{hash}.
+
+STORAGE_BACKEND picks one explicitly; by default Supabase is used when it is
+configured and the filesystem otherwise. The module-level functions below
+delegate to the active backend.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO
+
+import requests
+from requests.adapters import HTTPAdapter
+
 from app.core.config import settings
 
 SUPABASE_URL = settings.supabase_url
 SUPABASE_SERVICE_ROLE = settings.supabase_service_role
 BUCKET = settings.supabase_bucket
 
-def upload_image(data: bytes, content_type: str, path: str) -> str:
-    """Uploads to Supabase Storage via REST; returns public URL (bucket must be public)."""
-    if not (SUPABASE_URL and SUPABASE_SERVICE_ROLE):
-        # Return a placeholder URL - in production, you should configure Supabase
-        # For now, we'll store a data URL or skip upload
+UPLOAD_WORKERS = 4
+UPLOAD_ATTEMPTS = 3
+BACKOFF_BASE = 0.5  # seconds, doubled after each failed attempt
+TIMEOUT = (5, 30)  # connect, read
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+CHUNK = 64 * 1024
+IMAGE_EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp", "image/gif": "gif"}
+
+# Shared across requests so concurrent reports cannot exhaust the connection pool
+_executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="storage-upload")
+
+
+class UploadError(Exception):
+    """One or more objects of a batch could not be stored (the batch was rolled back)."""
+
+
+class DirectUploadUnsupported(Exception):
+    """The active backend cannot hand out signed upload URLs (check supports_direct_upload())."""
+
+
+def _chunks(data: bytes | BinaryIO):
+    """Iterate over bytes or a (rewound) file object in CHUNK-sized pieces."""
+    if isinstance(data, (bytes, bytearray)):
+        yield data
+        return
+    data.seek(0)
+    while chunk := data.read(CHUNK):
+        yield chunk
+
+
+def sniff_image_type(head: bytes) -> str | None:
+    """Image content type from the file's magic bytes, None if not an allowed image."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return None
+
+
+class SupabaseBackend:
+    name = "supabase"
+    supports_direct_upload = True
+
+    def __init__(self, url: str, service_role: str, bucket: str):
+        self.url = url.rstrip("/")
+        self.bucket = bucket
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=UPLOAD_WORKERS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Authorization"] = f"Bearer {service_role}"
+
+    def public_url(self, path: str) -> str:
+        return f"{self.url}/storage/v1/object/public/{self.bucket}/{path}"
+
+    def put(self, data: bytes | BinaryIO, content_type: str, path: str) -> str:
+        url = f"{self.url}/storage/v1/object/{self.bucket}/{path}"
+        for attempt in range(UPLOAD_ATTEMPTS):
+            last = attempt == UPLOAD_ATTEMPTS - 1
+            if not isinstance(data, (bytes, bytearray)):
+                data.seek(0)  # file objects are streamed, rewind for each attempt
+            try:
+                r = self.session.post(url, headers={
+                    "Content-Type": content_type,
+                    "x-upsert": "true",
+                }, data=data, timeout=TIMEOUT)
+            except (requests.ConnectionError, requests.Timeout):
+                if last:
+                    raise
+            else:
+                if r.status_code not in RETRY_STATUSES or last:
+                    r.raise_for_status()
+                    break
+            time.sleep(BACKOFF_BASE * 2 ** attempt)
+        return self.public_url(path)
+
+    def delete(self, paths: list[str]):
+        try:
+            r = self.session.delete(
+                f"{self.url}/storage/v1/object/{self.bucket}",
+                json={"prefixes": paths},
+                timeout=TIMEOUT,
+            )
+            r.raise_for_status()
+        except requests.RequestException as e:
+            logging.warning(f"Failed to delete {len(paths)} orphaned object(s): {e}")
+
+    def read(self, url: str) -> bytes:
+        r = self.session.get(url, timeout=TIMEOUT)
+        r.raise_for_status()
+        return r.content
+
+    def create_upload_target(self, path: str) -> str:
+        r = self.session.post(
+            f"{self.url}/storage/v1/object/upload/sign/{self.bucket}/{path}",
+            headers={"x-upsert": "false"},
+            timeout=TIMEOUT,
+        )
+        r.raise_for_status()
+        return f"{self.url}/storage/v1{r.json()['url']}"
+
+    def stat(self, path: str) -> tuple[int, str] | None:
+        r = self.session.head(
+            f"{self.url}/storage/v1/object/{self.bucket}/{path}", timeout=TIMEOUT
+        )
+        if r.status_code in (400, 404):
+            return None
+        r.raise_for_status()
+        content_type = r.headers.get("Content-Type", "").split(";")[0].strip()
+        return int(r.headers.get("Content-Length", 0)), content_type
+
+    def read_head(self, path: str, n: int) -> bytes:
+        with self.session.get(
+            f"{self.url}/storage/v1/object/{self.bucket}/{path}",
+            headers={"Range": f"bytes=0-{n - 1}"},
+            timeout=TIMEOUT,
+            stream=True,
+        ) as r:
+            r.raise_for_status()
+            # a server ignoring Range sends the whole object; stop after n bytes
+            return r.raw.read(n, decode_content=True)
+
+
+class FilesystemBackend:
+    name = "filesystem"
+    supports_direct_upload = False
+
+    def __init__(self, root: str, base_url: str):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def public_url(self, digest: str) -> str:
+        return f"{self.base_url}/{digest}"
+
+    def put(self, data: bytes | BinaryIO, content_type: str, path: str) -> str:
+        """Store by content hash; `path` is ignored, identical bytes share one file."""
+        if isinstance(data, (bytes, bytearray)):
+            digest = hashlib.sha256(data).hexdigest()
+            if self.blob_path(digest).exists():
+                return self.public_url(digest)
+        # stream into a temp file while hashing, then rename into place so
+        # readers never see a partial blob
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            h = hashlib.sha256()
+            with os.fdopen(fd, "wb") as f:
+                for chunk in _chunks(data):
+                    h.update(chunk)
+                    f.write(chunk)
+            digest = h.hexdigest()
+            target = self.blob_path(digest)
+            if target.exists():
+                os.unlink(tmp)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return self.public_url(digest)
+
+    def read(self, url: str) -> bytes:
+        digest = url.rsplit("/", 1)[-1]
+        if not url.startswith(self.base_url + "/") or len(digest) != 64:
+            raise FileNotFoundError(url)
+        return self.blob_path(digest).read_bytes()
+
+    def delete(self, paths: list[str]):
+        # Blobs are shared between attachments with identical bytes, so a
+        # rolled-back batch may not own them; unreferenced blobs are harmless.
+        pass
+
+
+def _make_backend():
+    choice = (settings.storage_backend or "").lower()
+    if not choice:
+        choice = "supabase" if SUPABASE_URL and SUPABASE_SERVICE_ROLE else "filesystem"
+    if choice == "supabase":
+        if not (SUPABASE_URL and SUPABASE_SERVICE_ROLE):
+            raise RuntimeError("STORAGE_BACKEND=supabase requires SUPABASE_URL and SUPABASE_SERVICE_ROLE")
+        return SupabaseBackend(SUPABASE_URL, SUPABASE_SERVICE_ROLE, BUCKET)
+    if choice == "filesystem":
+        return FilesystemBackend(settings.media_root, settings.media_base_url)
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {choice}")
+
+
+backend = _make_backend()
+
+
+def supports_direct_upload() -> bool:
+    return backend.supports_direct_upload
+
+
+def public_url(path: str) -> str:
+    return backend.public_url(path)
+
+
+def upload_image(data: bytes | BinaryIO, content_type: str, path: str) -> str:
+    """Stores one image (bytes or a file object, streamed) with the active backend; returns its public URL."""
+    return backend.put(data, content_type, path)
+
+
+def read_object(url: str) -> bytes:
+    """Bytes of a stored photo given the URL recorded for it (data: URLs included)."""
+    if url.startswith("data:"):
         import base64
-        b64 = base64.b64encode(data).decode('utf-8')
-        return f"data:{content_type};base64,{b64}"
-    url = f"{SUPABASE_URL}/storage/v1/object/{BUCKET}/{path}"
-    r = requests.post(url, headers={
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE}",
-        "Content-Type": content_type,
-        "x-upsert": "true",
-    }, data=data, timeout=30)
-    r.raise_for_status()
-    # public URL pattern:
-    return f"{SUPABASE_URL}/storage/v1/object/public/{BUCKET}/{path}"
-
-def make_object_key(issue_id: int, filename: str) -> str:
-    ext = (filename.rsplit(".",1)[-1] or "jpg").lower()
-    return f"{issue_id}/{uuid.uuid4().hex}.{ext}"
\ No newline at end of file
+        return base64.b64decode(url.partition(",")[2])
+    return backend.read(url)
+
+
+def delete_objects(paths: list[str]):
+    """Best-effort removal of stored objects (used to roll back a failed batch)."""
+    if paths:
+        backend.delete(paths)
+
+
+def upload_many(items: list[tuple[bytes | BinaryIO, str, str]]) -> list[str]:
+    """
+    Upload (data, content_type, path) items concurrently; returns URLs in input order.
+
+    All-or-nothing: if any upload fails after retries, the successful ones are
+    deleted and UploadError is raised.
+    """
+    if not items:
+        return []
+    futures = [_executor.submit(upload_image, *item) for item in items]
+    urls, stored, failed = [], [], None
+    for (_, _, path), fut in zip(items, futures):
+        try:
+            urls.append(fut.result())
+            stored.append(path)
+        except Exception as e:
+            failed = failed or e
+    if failed:
+        delete_objects(stored)
+        raise UploadError(str(failed)) from failed
+    return urls
+
+
+def create_upload_target(path: str) -> str:
+    """
+    Signed URL the client can PUT one object to, without the service key.
+
+    Supabase signed upload URLs are single-object and expire after two hours.
+    """
+    if not backend.supports_direct_upload:
+        raise DirectUploadUnsupported(type(backend).__name__)
+    return backend.create_upload_target(path)
+
+
+def stat_object(path: str) -> tuple[int, str] | None:
+    """(size in bytes, content type) of a stored object, None if it does not exist."""
+    if not backend.supports_direct_upload:
+        raise DirectUploadUnsupported(type(backend).__name__)
+    return backend.stat(path)
+
+
+def read_object_head(path: str, n: int = 16) -> bytes:
+    """First `n` bytes of a stored object (enough for sniff_image_type)."""
+    if not backend.supports_direct_upload:
+        raise DirectUploadUnsupported(type(backend).__name__)
+    return backend.read_head(path, n)
+
+
+def make_object_key(issue_id: int, content_type: str) -> str:
+    """New object key for an issue photo; the extension follows the (validated) content type."""
+    ext = IMAGE_EXTENSIONS.get(content_type, "bin")
+    return f"{issue_id}/{uuid.uuid4().hex}.{ext}"
@@ -0,0 +1,87 @@
+# app/services/timeline.py
+"""
+Issue timeline as one UNION ALL query.
+
+Entries come from the issue itself (created, current assignment),
+issue_activity rows and comments. Every entry carries a sort key
+(at, source rank, row id) that is unique within an issue, so the timeline
+can be walked with keyset cursors and polled with `since`.
+"""
+from sqlalchemy import Integer, String, Text, case, func, literal, literal_column, null, select, tuple_, union_all
+from sqlalchemy.orm import aliased
+
+from app.models.comment import IssueComment
+from app.models.issue import Issue
+from app.models.issue_activity import IssueActivity
+from app.models.user import User
+
+RANK_CREATED, RANK_ASSIGNED, RANK_ACTIVITY, RANK_COMMENT = range(4)
+
+
+def _display_name(user, fallback: str):
+    return func.coalesce(user.name, user.email, fallback)
+
+
+def _rank(rank: int):
+    # inlined rather than bound so every branch of the UNION has the same type
+    return literal_column(str(rank), Integer)
+
+
+def timeline_select(issue_id: int):
+    """Subquery of (kind, at, user, comment, rank, row_id) for one issue, unordered."""
+    creator = aliased(User, name="creator")
+    assignee = aliased(User, name="assignee")
+    author = aliased(User, name="author")
+
+    created = (
+        select(
+            literal("created", String).label("kind"),
+            Issue.created_at.label("at"),
+            case(
+                (Issue.created_by_id.is_(None), null()),
+                else_=_display_name(creator, "Anonymous"),
+            ).label("user"),
+            null().cast(Text).label("comment"),
+            _rank(RANK_CREATED).label("rank"),
+            Issue.id.label("row_id"),
+        )
+        .outerjoin(creator, creator.id == Issue.created_by_id)
+        .where(Issue.id == issue_id, Issue.created_at.is_not(None))
+    )
+    assigned = (
+        select(
+            literal("assigned", String),
+            func.coalesce(Issue.updated_at, Issue.created_at),
+            _display_name(assignee, "Unknown"),
+            null().cast(Text),
+            _rank(RANK_ASSIGNED),
+            Issue.id,
+        )
+        .join(assignee, assignee.id == Issue.assigned_to_id)
+        .where(Issue.id == issue_id)
+    )
+    activity = select(
+        IssueActivity.kind,
+        IssueActivity.at,
+        null().cast(String),
+        null().cast(Text),
+        _rank(RANK_ACTIVITY),
+        IssueActivity.id,
+    ).where(IssueActivity.issue_id == issue_id, IssueActivity.kind != "created")
+    comments = (
+        select(
+            literal("comment", String),
+            IssueComment.created_at,
+            _display_name(author, "Anonymous"),
+            IssueComment.body,
+            _rank(RANK_COMMENT),
+            IssueComment.id,
+        )
+        .outerjoin(author, author.id == IssueComment.user_id)
+        .where(IssueComment.issue_id == issue_id)
+    )
+    return union_all(created, assigned, activity, comments).subquery("timeline")
+
+
+def timeline_key(t):
+    return tuple_(t.c.at, t.c.rank, t.c.row_id)
@@ -0,0 +1,54 @@
+# app/services/workload.py
+"""
+Open-issue counts per assignee (staff_workload).
+
+Counts are adjusted in the same transaction as the issue change by ORM
+listeners on Issue (app/models/issue.py); set-based UPDATE/DELETE paths
+call adjust_workload() themselves. `reconcile_workload` recomputes every
+count from the issues table and is safe to run while the API is serving
+(scripts/reconcile_workload.py, e.g. nightly from cron).
+"""
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.issue import Issue, OPEN_STATUSES
+from app.models.staff_workload import StaffWorkload
+from app.models.user import User, UserRole
+
+ASSIGNABLE_ROLES = (UserRole.staff, UserRole.admin, UserRole.super_admin)
+
+
+def reconcile_workload(db: Session) -> int:
+    """
+    Recompute all open counts from issues; returns how many rows changed.
+
+    Takes a lock that blocks concurrent adjust_workload() calls (not reads)
+    for the duration, so no increment can slip between count and write.
+    """
+    db.execute(text("LOCK TABLE staff_workload IN SHARE ROW EXCLUSIVE MODE"))
+    actual = (
+        select(User.id.label("user_id"), func.count(Issue.id).label("open_count"))
+        .select_from(User)
+        .outerjoin(
+            Issue,
+            (Issue.assigned_to_id == User.id) & Issue.status.in_(OPEN_STATUSES),
+        )
+        .where(
+            or_(
+                User.role.in_(ASSIGNABLE_ROLES),
+                User.id.in_(select(StaffWorkload.user_id)),
+                User.id.in_(select(Issue.assigned_to_id)),
+            )
+        )
+        .group_by(User.id)
+    )
+    stmt = insert(StaffWorkload).from_select(["user_id", "open_count"], actual)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StaffWorkload.user_id],
+        set_={"open_count": stmt.excluded.open_count, "updated_at": func.now()},
+        where=StaffWorkload.open_count != stmt.excluded.open_count,
+    ).returning(StaffWorkload.user_id)
+    changed = len(db.execute(stmt).all())
+    db.commit()
+    return changed
@@ -0,0 +1,197 @@
+# app/workers/notifications.py
+"""
+Notification worker: drains notification_outbox outside the API process.
+
+    python -m app.workers.notifications [--once]
+
+Each round claims up to BATCH_SIZE due rows with FOR UPDATE SKIP LOCKED, so
+any number of workers can run side by side. Claiming pushes the row's
+available_at forward by LEASE_SECONDS instead of holding a lock or a
+connection during network I/O; if a worker dies, its rows become due again
+when the lease runs out.
+
+Events are expanded into delivery rows on up to CONCURRENCY threads (in the
+same transaction that marks the event sent). The batch's emails then go out
+together over pooled SMTP sessions, and its pushes through the concurrent
+push dispatcher, which also prunes expired subscriptions. A failed row is
+retried with exponential backoff and marked dead after MAX_ATTEMPTS.
+
+Every DIGEST_FLUSH_SECONDS the worker also turns due email digests into
+outbox deliveries (see notifications.flush_digests).
+"""
+import argparse
+import logging
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from sqlalchemy import func, select, update
+
+from app.db.session import SessionLocal
+from app.models.notification_outbox import NotificationOutbox
+from app.services import notifications
+
+BATCH_SIZE = 50
+CONCURRENCY = 8  # stays below the session pool size (5 + 10 overflow)
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 30  # seconds, doubled after each failed attempt
+BACKOFF_MAX = 6 * 3600
+IDLE_SECONDS = 2.0
+DIGEST_FLUSH_SECONDS = 30
+
+log = logging.getLogger("notifications")
+
+
+def claim(db, limit: int = BATCH_SIZE):
+    """Lease up to `limit` due rows to this worker; returns (id, kind, payload, attempts)."""
+    due = (
+        select(NotificationOutbox.id)
+        .where(NotificationOutbox.status == "pending", NotificationOutbox.available_at <= func.now())
+        .order_by(NotificationOutbox.available_at, NotificationOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    rows = db.execute(
+        update(NotificationOutbox)
+        .where(NotificationOutbox.id.in_(due.scalar_subquery()))
+        .values(
+            available_at=func.now() + timedelta(seconds=LEASE_SECONDS),
+            attempts=NotificationOutbox.attempts + 1,
+        )
+        .returning(
+            NotificationOutbox.id,
+            NotificationOutbox.kind,
+            NotificationOutbox.payload,
+            NotificationOutbox.attempts,
+        )
+    ).all()
+    db.commit()
+    return rows
+
+
+def _mark_sent(db, ids):
+    db.execute(
+        update(NotificationOutbox)
+        .where(NotificationOutbox.id.in_(ids))
+        .values(status="sent", sent_at=func.now(), last_error=None)
+    )
+
+
+def _mark_failed(db, row, error: Exception):
+    values = {"last_error": f"{type(error).__name__}: {error}"[:2000]}
+    if row.attempts >= MAX_ATTEMPTS:
+        values["status"] = "dead"
+        log.error(f"Giving up on outbox #{row.id} ({row.kind}) after {row.attempts} attempts: {error}")
+    else:
+        delay = min(BACKOFF_BASE * 2 ** (row.attempts - 1), BACKOFF_MAX)
+        values["available_at"] = func.now() + timedelta(seconds=delay)
+        log.warning(f"Outbox #{row.id} ({row.kind}) failed, retrying in {delay}s: {error}")
+    db.execute(update(NotificationOutbox).where(NotificationOutbox.id == row.id).values(**values))
+
+
+def process(row) -> Exception | None:
+    """Handle one claimed row; returns the error, if any."""
+    db = SessionLocal()
+    try:
+        if row.kind in notifications.EVENTS:
+            # deliveries and the event's completion commit together
+            db.add_all(notifications.expand(db, row.kind, row.payload))
+            _mark_sent(db, [row.id])
+            db.commit()
+        else:
+            notifications.deliver(db, row.kind, row.payload)
+        return None
+    except Exception as e:
+        db.rollback()
+        return e
+    finally:
+        db.close()
+
+
+def run_once(pool: ThreadPoolExecutor) -> int:
+    """Claim and process one batch; returns the number of rows claimed."""
+    db = SessionLocal()
+    try:
+        rows = claim(db)
+        if not rows:
+            return 0
+        pushes = [row for row in rows if row.kind == "push"]
+        emails = [row for row in rows if row.kind == "email"]
+        others = [row for row in rows if row.kind not in ("push", "email")]
+        errors = dict(zip((row.id for row in others), pool.map(process, others)))
+        if emails:
+            errors.update(notifications.deliver_emails(emails))
+        if pushes:
+            try:
+                errors.update(notifications.deliver_pushes(db, pushes))
+            except Exception as e:
+                db.rollback()
+                errors.update((row.id, e) for row in pushes)
+
+        delivered = [
+            row.id for row in rows
+            if errors[row.id] is None and row.kind not in notifications.EVENTS
+        ]
+        if delivered:
+            _mark_sent(db, delivered)
+        for row in rows:
+            if errors[row.id] is not None:
+                _mark_failed(db, row, errors[row.id])
+        db.commit()
+        return len(rows)
+    finally:
+        db.close()
+
+
+def flush_digests() -> int:
+    db = SessionLocal()
+    try:
+        queued = notifications.flush_digests(db)
+        db.commit()
+    finally:
+        db.close()
+    if queued:
+        log.info(f"Queued {queued} digest email(s)")
+    return queued
+
+
+def run(stop: threading.Event, once: bool = False):
+    last_flush = 0.0
+    with ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix="notify") as pool:
+        while not stop.is_set():
+            if once or time.monotonic() - last_flush >= DIGEST_FLUSH_SECONDS:
+                last_flush = time.monotonic()
+                try:
+                    flush_digests()
+                except Exception as e:
+                    log.error(f"Digest flush failed: {e}", exc_info=True)
+            try:
+                claimed = run_once(pool)
+            except Exception as e:
+                log.error(f"Notification worker round failed: {e}", exc_info=True)
+                claimed = 0
+            if once and not claimed:
+                break
+            if claimed < BATCH_SIZE:
+                stop.wait(IDLE_SECONDS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--once", action="store_true", help="exit when the outbox has no due rows")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    log.info("Notification worker started")
+    run(stop, once=args.once)
+    log.info("Notification worker stopped")
+
+
+if __name__ == "__main__":
+    main()
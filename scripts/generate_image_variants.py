@@ -0,0 +1,46 @@
+# scripts/generate_image_variants.py
+"""
+Backfill thumbnails / WebP renditions for attachments that have none yet
+(photos uploaded before app/services/images.py existed).
+
+    python -m scripts.generate_image_variants
+"""
+from sqlalchemy import exists
+
+from app.db.session import SessionLocal
+from app.models.attachment import IssueAttachment, IssueAttachmentVariant
+from app.services.images import generate_variants_safe
+
+BATCH = 50
+
+
+def main():
+    done = 0
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            ids = [
+                r[0]
+                for r in db.query(IssueAttachment.id)
+                .filter(
+                    IssueAttachment.id > last_id,
+                    ~exists().where(IssueAttachmentVariant.attachment_id == IssueAttachment.id),
+                )
+                .order_by(IssueAttachment.id)
+                .limit(BATCH)
+                .all()
+            ]
+        finally:
+            db.close()
+        if not ids:
+            break
+        generate_variants_safe(ids)
+        last_id = ids[-1]
+        done += len(ids)
+        print(f"  ...processed {done} attachment(s)")
+    print(f"Done: {done} attachment(s)")
+
+
+if __name__ == "__main__":
+    main()
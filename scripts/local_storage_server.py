@@ -0,0 +1,153 @@
+# scripts/local_storage_server.py
+"""
+Stand-in for the subset of the Supabase Storage REST API the backend uses,
+backed by a local directory. Useful for development and tests without a
+Supabase project:
+
+    python -m scripts.local_storage_server --port 54321 --root /tmp/imc-storage
+
+then run the API with
+
+    SUPABASE_URL=http://localhost:54321
+    SUPABASE_SERVICE_ROLE=local-service-role
+
+Implemented routes (under /storage/v1):
+
+    POST   /object/{bucket}/{path}              upload (service key)
+    HEAD   /object/{bucket}/{path}              size / content type (service key)
+    DELETE /object/{bucket}                     {"prefixes": [...]} (service key)
+    POST   /object/upload/sign/{bucket}/{path}  signed upload URL (service key)
+    PUT    /object/upload/sign/{bucket}/{path}  upload with ?token=
+    GET    /object/public/{bucket}/{path}       public download
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import time
+from pathlib import Path
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+SERVICE_ROLE = os.environ.get("LOCAL_STORAGE_SERVICE_ROLE", "local-service-role")
+ROOT = Path(os.environ.get("LOCAL_STORAGE_ROOT", "/tmp/imc-storage"))
+SIGNED_UPLOAD_TTL = 2 * 60 * 60  # same as Supabase
+
+app = FastAPI(title="Local storage stand-in")
+
+
+def _require_service_key(request: Request):
+    if request.headers.get("authorization") != f"Bearer {SERVICE_ROLE}":
+        raise HTTPException(status_code=401, detail="Invalid service key")
+
+
+def _object_path(bucket: str, path: str) -> Path:
+    target = (ROOT / bucket / path).resolve()
+    if not target.is_relative_to((ROOT / bucket).resolve()):
+        raise HTTPException(status_code=400, detail="Invalid object path")
+    return target
+
+
+def _meta_path(target: Path) -> Path:
+    return target.with_name(target.name + ".meta.json")
+
+
+def _sign(bucket: str, path: str, expires: int) -> str:
+    msg = f"{bucket}/{path}:{expires}".encode()
+    digest = hmac.new(SERVICE_ROLE.encode(), msg, hashlib.sha256).hexdigest()
+    return f"{expires}.{digest}"
+
+
+def _write(bucket: str, path: str, body: bytes, content_type: str, upsert: bool):
+    target = _object_path(bucket, path)
+    if target.exists() and not upsert:
+        raise HTTPException(status_code=409, detail="The resource already exists")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(body)
+    _meta_path(target).write_text(json.dumps({"content_type": content_type}))
+    return {"Key": f"{bucket}/{path}"}
+
+
+def _content_type(request: Request) -> str:
+    return request.headers.get("content-type", "application/octet-stream").split(";")[0]
+
+
+@app.post("/storage/v1/object/upload/sign/{bucket}/{path:path}")
+def sign_upload(bucket: str, path: str, request: Request):
+    _require_service_key(request)
+    token = _sign(bucket, path, int(time.time()) + SIGNED_UPLOAD_TTL)
+    return {"url": f"/object/upload/sign/{bucket}/{path}?token={token}"}
+
+
+@app.put("/storage/v1/object/upload/sign/{bucket}/{path:path}")
+async def signed_upload(bucket: str, path: str, token: str, request: Request):
+    expires, _, _ = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        raise HTTPException(status_code=400, detail="Signed upload URL expired")
+    if not hmac.compare_digest(token, _sign(bucket, path, int(expires))):
+        raise HTTPException(status_code=400, detail="Invalid signature")
+    return _write(bucket, path, await request.body(), _content_type(request), upsert=False)
+
+
+@app.post("/storage/v1/object/{bucket}/{path:path}")
+async def upload(bucket: str, path: str, request: Request):
+    _require_service_key(request)
+    upsert = request.headers.get("x-upsert") == "true"
+    return _write(bucket, path, await request.body(), _content_type(request), upsert)
+
+
+@app.head("/storage/v1/object/{bucket}/{path:path}")
+def stat(bucket: str, path: str, request: Request):
+    _require_service_key(request)
+    target = _object_path(bucket, path)
+    if not target.is_file():
+        return Response(status_code=404)
+    meta = json.loads(_meta_path(target).read_text())
+    return Response(
+        headers={
+            "Content-Length": str(target.stat().st_size),
+            "Content-Type": meta["content_type"],
+        }
+    )
+
+
+@app.delete("/storage/v1/object/{bucket}")
+async def delete(bucket: str, request: Request):
+    _require_service_key(request)
+    deleted = []
+    for path in (await request.json()).get("prefixes", []):
+        target = _object_path(bucket, path)
+        if target.is_file():
+            target.unlink()
+            _meta_path(target).unlink(missing_ok=True)
+            deleted.append({"name": path})
+    return deleted
+
+
+@app.get("/storage/v1/object/public/{bucket}/{path:path}")
+def download(bucket: str, path: str):
+    target = _object_path(bucket, path)
+    if not target.is_file():
+        raise HTTPException(status_code=404, detail="Object not found")
+    meta = json.loads(_meta_path(target).read_text())
+    return FileResponse(target, media_type=meta["content_type"])
+
+
+def main():
+    global ROOT
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--root", default=str(ROOT))
+    args = parser.parse_args()
+    ROOT = Path(args.root)
+    ROOT.mkdir(parents=True, exist_ok=True)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# scripts/migrate_data_urls.py
+"""
+Move photos stored inline as base64 `data:` URLs in issue_attachments.url
+into the active storage backend (STORAGE_BACKEND / MEDIA_ROOT, see
+app/services/storage.py) and point the rows at the stored objects.
+
+    python -m scripts.migrate_data_urls            # migrate
+    python -m scripts.migrate_data_urls --dry-run  # only report
+
+Rows are processed in id order, BATCH at a time, each batch in its own
+transaction, so the script can be interrupted and re-run safely.
+"""
+import argparse
+import base64
+import binascii
+
+from app.db.session import SessionLocal
+from app.models.attachment import IssueAttachment
+from app.services import storage
+from app.services.storage import make_object_key, sniff_image_type
+
+BATCH = 200
+
+
+def parse_data_url(url: str) -> tuple[str, bytes] | None:
+    header, sep, payload = url.partition(",")
+    if not sep or not header.startswith("data:") or ";base64" not in header:
+        return None
+    try:
+        data = base64.b64decode(payload, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+    content_type = sniff_image_type(data[:16]) or header[5:].split(";")[0]
+    return content_type, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move data: URL photos into storage")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    print(f"Storage backend: {storage.backend.name}")
+    migrated = skipped = 0
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(IssueAttachment)
+                .filter(IssueAttachment.id > last_id, IssueAttachment.url.like("data:%"))
+                .order_by(IssueAttachment.id)
+                .limit(BATCH)
+                .all()
+            )
+            if not rows:
+                break
+            for att in rows:
+                last_id = att.id
+                parsed = parse_data_url(att.url)
+                if parsed is None:
+                    print(f"  #{att.id}: not a base64 data URL, skipped")
+                    skipped += 1
+                    continue
+                content_type, data = parsed
+                if args.dry_run:
+                    migrated += 1
+                    continue
+                key = make_object_key(att.issue_id, content_type)
+                att.url = storage.upload_image(data, content_type, key)
+                att.content_type = content_type
+                att.size = len(data)
+                migrated += 1
+            if not args.dry_run:
+                db.commit()
+        finally:
+            db.close()
+        print(f"  ...up to attachment #{last_id}")
+
+    verb = "Would migrate" if args.dry_run else "Migrated"
+    print(f"{verb} {migrated} attachment(s), skipped {skipped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+# scripts/reconcile_workload.py
+"""
+Recompute staff_workload open counts from the issues table, repairing any
+drift (e.g. from manual SQL edits). Safe to run while the API is serving:
+
+    python -m scripts.reconcile_workload
+"""
+from app.db.session import SessionLocal
+from app.services.workload import reconcile_workload
+
+
+def main():
+    db = SessionLocal()
+    try:
+        changed = reconcile_workload(db)
+    finally:
+        db.close()
+    print(f"Reconciled staff_workload: {changed} row(s) inserted or corrected")
+
+
+if __name__ == "__main__":
+    main()